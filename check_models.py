@@ -1,7 +1,7 @@
 # check_models.py
 import os
 import asyncio
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAioHttpClient
 from dotenv import load_dotenv
 
 # .env 파일 로드
@@ -10,9 +10,11 @@ load_dotenv()
 async def list_available_models():
     api_key = os.getenv("FIREWORKS_API_KEY")
     
+    # httpx 대신 aiohttp 전송 계층 사용 (동시 요청 오버헤드 감소)
     client = AsyncOpenAI(
         api_key=api_key,
-        base_url="https://api.fireworks.ai/inference/v1"
+        base_url="https://api.fireworks.ai/inference/v1",
+        http_client=DefaultAioHttpClient()
     )
 
     print("🔍 Fireworks AI 모델 목록 조회 중...")
@@ -24,15 +26,17 @@ async def list_available_models():
         print("\n✅ 사용 가능한 모델 목록:")
         print("="*50)
         
-        # 'llama'가 포함된 모델만 필터링해서 보여줌 (너무 많으므로)
-        for model in models.data:
-            if "qwen" in model.id.lower(): 
-                print(f"📄 {model.id}")
+        # 'qwen'이 포함된 모델만 필터링해서 보여줌 (너무 많으므로)
+        matched = (model.id for model in models.data if "qwen" in model.id.lower())
+        for model_id in matched:
+            print(f"📄 {model_id}")
                 
         print("="*50)
         
     except Exception as e:
         print(f"❌ 목록 조회 실패: {e}")
+    finally:
+        await client.close()
 
 if __name__ == "__main__":
     asyncio.run(list_available_models())
\ No newline at end of file
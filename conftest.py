@@ -0,0 +1,9 @@
+"""
+Pytest configuration for Xueqiu Crawler tests.
+Makes the `src` package importable when tests run from any directory.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
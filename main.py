@@ -16,30 +16,33 @@ Usage:
     python main.py --no-llm                # Skip LLM summarization
 """
 
+from __future__ import annotations
+
 import asyncio
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 from rich.table import Table
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.config import AppSettings, TabName, load_settings
-from src.crawler import XueqiuCrawler
-from src.llm_summarizer import LLMSummarizer, MockLLMSummarizer
-from src.models import PostData, PostSummary, TabStatistics
-from src.report_generator import ReportGenerator
-from src.storage import StorageManager, IncrementalSaver
+from src.config import TAB_BY_VALUE, AppSettings, TabName, load_settings
 from src.utils import setup_logging, get_logger
 
+# Pipeline modules (Playwright, OpenAI, storage) are imported where they are
+# used so that utility commands like `version` and `list-tabs` start fast.
+if TYPE_CHECKING:
+    from src.llm_summarizer import LLMSummarizer
+    from src.models import PostData, PostSummary
+    from src.storage import IncrementalSaver, StorageManager
+
 # CLI app
 app = typer.Typer(
     name="xueqiu-crawler",
@@ -50,6 +53,21 @@ app = typer.Typer(
 # Console for rich output
 console = Console()
 
+# All tabs, built once
+_ALL_TABS = tuple(TabName)
+
+# Tab descriptions for `list-tabs`
+_TAB_DESCRIPTIONS = (
+    (TabName.REMEN, "Hot/Trending Discussions"),
+    (TabName.QIXERSHISI, "24/7 Live News & Updates"),
+    (TabName.SHIPIN, "Video Content"),
+    (TabName.JIJIN, "Mutual Funds Discussions"),
+    (TabName.ZIXUN, "News & Information"),
+    (TabName.DAREN, "Expert/Influencer Posts"),
+    (TabName.SIMU, "Private Equity Discussions"),
+    (TabName.ETF, "ETF Discussions"),
+)
+
 
 def parse_tabs(tabs: List[str]) -> List[TabName]:
     """
@@ -61,19 +79,220 @@ def parse_tabs(tabs: List[str]) -> List[TabName]:
     Returns:
         List of TabName enums
     """
-    if not tabs or "all" in [t.lower() for t in tabs]:
-        return list(TabName)
+    if not tabs or any(t.lower() == "all" for t in tabs):
+        return list(_ALL_TABS)
     
-    parsed = []
-    tab_mapping = {t.value: t for t in TabName}
+    parsed = [TAB_BY_VALUE[t] for t in tabs if t in TAB_BY_VALUE]
     
     for tab in tabs:
-        if tab in tab_mapping:
-            parsed.append(tab_mapping[tab])
-        else:
+        if tab not in TAB_BY_VALUE:
             console.print(f"[yellow]Warning: Unknown tab '{tab}'[/yellow]")
     
-    return parsed or list(TabName)
+    return parsed or list(_ALL_TABS)
+
+
+# Maximum posts waiting for summarization before the crawl is throttled
+SUMMARY_QUEUE_SIZE = 256
+
+
+class SummaryPipeline:
+    """
+    Summarizes posts while the crawl is still producing them.
+    
+    Crawled posts go onto a bounded queue drained by a pool of workers,
+    each packing whatever is queued into a single summarization request.
+    Each distinct text is summarized once; repeats (in any tab) get a copy
+    of the first summary. A tab is finished, saved and reported through
+    on_tab_complete once its crawl is done and all its posts are summarized.
+    """
+    
+    def __init__(
+        self,
+        summarizer: LLMSummarizer,
+        storage: StorageManager,
+        workers: int,
+        on_tab_complete: Optional[Callable[[str, List[PostData], List[PostSummary]], None]] = None
+    ):
+        """
+        Initialize summary pipeline.
+        
+        Args:
+            summarizer: LLM summarizer (or mock) to use
+            storage: Storage manager
+            workers: Number of concurrent summarization workers
+            on_tab_complete: Optional function called with each tab's posts
+                and summaries as soon as that tab is done
+        """
+        self.summarizer = summarizer
+        self.storage = storage
+        self.workers = workers
+        self.on_tab_complete = on_tab_complete
+        self.logger = get_logger("summary_pipeline")
+        
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=SUMMARY_QUEUE_SIZE)
+        self._worker_tasks: List[asyncio.Task] = []
+        self._copy_tasks: List[asyncio.Task] = []
+        self._save_tasks: List[asyncio.Task] = []
+        
+        # Text hash -> future of the first summary for that text
+        self._by_text: Dict[int, asyncio.Future] = {}
+        self._duplicates = 0
+        
+        self._posts: Dict[str, List[PostData]] = {}
+        self._summaries: Dict[str, List[PostSummary]] = {}
+        self._pending: Dict[str, int] = {}
+        self._crawled: set = set()
+        self._completed: set = set()
+    
+    def start(self):
+        """Start the summarization workers."""
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+    
+    def _track_tab(self, tab: str):
+        """Register a tab the first time it is seen."""
+        if tab not in self._posts:
+            self._posts[tab] = []
+            self._summaries[tab] = []
+            self._pending[tab] = 0
+    
+    async def add_posts(self, tab: str, posts: List[PostData]):
+        """
+        Queue crawled posts for summarization.
+        
+        Blocks while the queue is full, throttling the crawl to the
+        summarization rate.
+        
+        Args:
+            tab: Tab name
+            posts: Newly crawled posts
+        """
+        self._track_tab(tab)
+        loop = asyncio.get_running_loop()
+        
+        for post in posts:
+            self._posts[tab].append(post)
+            self._pending[tab] += 1
+            
+            key = post.text_digest
+            source = self._by_text.get(key)
+            if source is not None:
+                self._duplicates += 1
+                self._copy_tasks.append(asyncio.create_task(
+                    self._copy_summary(tab, post, source)
+                ))
+                continue
+            
+            future = loop.create_future()
+            self._by_text[key] = future
+            await self._queue.put((tab, post, future))
+    
+    async def _copy_summary(self, tab: str, post: PostData, source: asyncio.Future):
+        """Give a repeated post a copy of its text's first summary."""
+        summary = await source
+        if summary is not None:
+            self._summaries[tab].append(summary.model_copy(update={
+                "post_id": post.id,
+                "post_hash": post.content_hash,
+                "tab": post.tab,
+            }))
+        self._post_done(tab)
+    
+    async def _worker(self):
+        """Summarize queued posts, packing everything waiting into one request."""
+        while True:
+            items = [await self._queue.get()]
+            while len(items) < self.summarizer.llm_settings.pack_size and not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            
+            by_id: Dict[str, PostSummary] = {}
+            try:
+                summaries = await self.summarizer.summarize_posts(
+                    [post for _, post, _ in items], batch_size=1
+                )
+                by_id = {s.post_id: s for s in summaries}
+            except Exception as e:
+                self.logger.error(f"Summarization failed for {len(items)} posts: {e}")
+            finally:
+                for tab, post, future in items:
+                    summary = by_id.get(post.id)
+                    future.set_result(summary)
+                    if summary is not None:
+                        self._summaries[tab].append(summary)
+                    self._post_done(tab)
+                    self._queue.task_done()
+    
+    def _post_done(self, tab: str):
+        """Record one finished post and complete the tab if it was the last."""
+        self._pending[tab] -= 1
+        self._maybe_complete(tab)
+    
+    def finish_tab(self, tab: str):
+        """
+        Mark a tab's crawl as finished.
+        
+        Args:
+            tab: Tab name
+        """
+        self._track_tab(tab)
+        self._crawled.add(tab)
+        self._maybe_complete(tab)
+    
+    def _maybe_complete(self, tab: str):
+        """Save and report a tab once it is crawled and fully summarized."""
+        if tab in self._completed or tab not in self._crawled or self._pending[tab]:
+            return
+        
+        self._completed.add(tab)
+        summaries = self._summaries[tab]
+        
+        # Write this tab's summaries while other tabs are still in flight
+        self._save_tasks.append(asyncio.create_task(
+            self.storage.save_summaries(tab, summaries, incremental=True)
+        ))
+        
+        if self.on_tab_complete:
+            self.on_tab_complete(tab, self._posts[tab], summaries)
+    
+    async def join(self) -> Dict[str, List[PostSummary]]:
+        """
+        Wait for all queued posts to be summarized and saved.
+        
+        Returns:
+            Dictionary mapping tab names to summaries
+        """
+        try:
+            await self._queue.join()
+            await asyncio.gather(*self._copy_tasks)
+        finally:
+            await self._stop_workers()
+            # Surface save errors, and never abandon writes already in flight
+            await asyncio.gather(*self._save_tasks)
+        
+        if self._duplicates:
+            self.logger.info(f"Reused summaries for {self._duplicates} duplicate posts")
+        return dict(self._summaries)
+    
+    async def _stop_workers(self):
+        """Cancel the workers and any copies still waiting on a summary."""
+        tasks = self._worker_tasks + self._copy_tasks
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def close(self):
+        """
+        Stop the pipeline without draining the queue.
+        
+        Used when the crawl fails: workers are cancelled, but summaries of
+        tabs that already completed are still written. Safe to call after
+        join().
+        """
+        await self._stop_workers()
+        for result in await asyncio.gather(*self._save_tasks, return_exceptions=True):
+            if isinstance(result, BaseException):
+                self.logger.error(f"Error saving summaries: {result}")
 
 
 async def run_crawler(
@@ -98,6 +317,13 @@ async def run_crawler(
     Returns:
         Dictionary with results
     """
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+    
+    from src.crawler import XueqiuCrawler
+    from src.llm_summarizer import LLMSummarizer, MockLLMSummarizer
+    from src.report_generator import ReportGenerator
+    from src.summary_cache import SummaryCache
+    
     logger = get_logger("main")
     results = {
         "posts_by_tab": {},
@@ -109,76 +335,120 @@ async def run_crawler(
     # Start incremental saver
     await saver.start()
     
+    # Render each tab's report section in a worker thread as soon as that
+    # tab's summaries are ready, overlapping with the remaining work
+    generator = ReportGenerator(settings)
+    section_tasks: Dict[str, asyncio.Task] = {}
+    
     try:
-        # Phase 1: Crawling
-        console.print(Panel("[bold blue]Phase 1: Crawling Xueqiu Discussions[/bold blue]"))
+        cache = None
+        if use_llm and settings.llm.api_key:
+            if settings.llm.cache_enabled:
+                cache = SummaryCache(settings)
+                cache.load()
+            summarizer = LLMSummarizer(settings, cache=cache)
+        else:
+            console.print("[yellow]⚠️ Using fallback summarization (no LLM API key)[/yellow]")
+            summarizer = MockLLMSummarizer(settings)
+        
+        # Phase 1: Crawling and summarizing, overlapped
+        if console.is_terminal:
+            console.print(Panel("[bold blue]Phase 1: Crawling & Summarizing Xueqiu Discussions[/bold blue]"))
         
-        async with XueqiuCrawler(settings) as crawler:
-            # Set callback for incremental saving
-            async def save_callback(tab: str, posts: List[PostData]):
+        async with summarizer, XueqiuCrawler(settings) as crawler:
+            def render_tab_section(tab: str, posts: List[PostData], summaries: List[PostSummary]):
+                section_tasks[tab] = asyncio.create_task(asyncio.to_thread(
+                    generator.render_tab_section,
+                    tab,
+                    posts,
+                    summaries,
+                    crawler.get_statistics().get(tab)
+                ))
+            
+            pipeline = SummaryPipeline(
+                summarizer, storage,
+                settings.llm.max_concurrent_requests,
+                on_tab_complete=render_tab_section
+            )
+            pipeline.start()
+            
+            # Save each scroll's posts and queue them for summarization
+            async def post_callback(tab: str, posts: List[PostData]):
                 await saver.add_posts(tab, posts)
+                await pipeline.add_posts(tab, posts)
             
-            crawler.set_post_callback(save_callback)
+            crawler.set_post_callback(post_callback)
             
-            # Crawl tabs with progress bar
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-                console=console
-            ) as progress:
-                task = progress.add_task(
-                    f"Crawling {len(tabs)} tabs...",
-                    total=len(tabs)
-                )
+            def tab_crawled(tab: str):
+                progress.update(task, advance=1)
+                pipeline.finish_tab(tab)
+            
+            try:
+                # Crawl tabs with progress bar
+                with Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    BarColumn(),
+                    TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                    console=console
+                ) as progress:
+                    task = progress.add_task(
+                        f"Crawling {len(tabs)} tabs...",
+                        total=len(tabs)
+                    )
+                    
+                    results["posts_by_tab"] = await crawler.crawl_tabs(
+                        tabs,
+                        max_posts,
+                        on_tab_complete=tab_crawled
+                    )
+                    results["tab_stats"] = crawler.get_statistics()
                 
-                results["posts_by_tab"] = await crawler.crawl_tabs(tabs, max_posts)
-                results["tab_stats"] = crawler.get_statistics()
+                # Write the incremental saver's pending summaries to disk
+                await saver.flush()
                 
-                progress.update(task, completed=len(tabs))
-        
-        # Save final posts
-        for tab, posts in results["posts_by_tab"].items():
-            await storage.save_posts(tab, posts, incremental=True)
-        
-        # Display crawl summary
-        total_posts = sum(len(posts) for posts in results["posts_by_tab"].values())
-        console.print(f"✅ Collected [green]{total_posts}[/green] posts from {len(results['posts_by_tab'])} tabs")
-        
-        # Phase 2: LLM Summarization
-        if use_llm and settings.llm.api_key:
-            console.print(Panel("[bold blue]Phase 2: LLM Summarization[/bold blue]"))
-            
-            async with LLMSummarizer(settings) as summarizer:
-                for tab, posts in results["posts_by_tab"].items():
-                    summaries = await summarizer.summarize_posts(posts)
-                    results["summaries_by_tab"][tab] = summaries
-                    await storage.save_summaries(tab, summaries, incremental=True)
+                total_posts = sum(len(posts) for posts in results["posts_by_tab"].values())
+                console.print(f"✅ Collected [green]{total_posts}[/green] posts from {len(results['posts_by_tab'])} tabs")
                 
-                stats = summarizer.get_statistics()
-                console.print(
-                    f"✅ Generated [green]{stats['successful_requests']}[/green] summaries "
-                    f"({stats['failed_requests']} failures)"
-                )
-        else:
-            console.print("[yellow]⚠️ Using fallback summarization (no LLM API key)[/yellow]")
+                # Finish summarizing whatever is still queued
+                results["summaries_by_tab"] = await pipeline.join()
+            finally:
+                # On failure, stop the workers and keep finished tabs' saves
+                await pipeline.close()
             
-            async with MockLLMSummarizer(settings) as summarizer:
-                for tab, posts in results["posts_by_tab"].items():
-                    summaries = await summarizer.summarize_posts(posts)
-                    results["summaries_by_tab"][tab] = summaries
-                    await storage.save_summaries(tab, summaries, incremental=True)
+            stats = summarizer.get_statistics()
+            total_summaries = sum(
+                len(s) for s in results["summaries_by_tab"].values()
+            )
+            console.print(
+                f"✅ Generated [green]{total_summaries}[/green] summaries in "
+                f"{stats['successful_requests']} requests "
+                f"({stats['failed_requests']} failures)"
+            )
         
-        # Phase 3: Report Generation
-        console.print(Panel("[bold blue]Phase 3: Report Generation[/bold blue]"))
+        if cache is not None:
+            cache.save()
+            cache_stats = cache.get_statistics()
+            console.print(
+                f"✅ Summary cache: [green]{cache_stats['hits'] + cache_stats['semantic_hits']}"
+                f"[/green] hits, {cache_stats['misses']} misses"
+            )
         
-        generator = ReportGenerator(settings)
+        # Phase 2: Report Generation
+        if console.is_terminal:
+            console.print(Panel("[bold blue]Phase 2: Report Generation[/bold blue]"))
+        
+        tab_sections = [
+            await section_tasks[tab]
+            for tab in results["posts_by_tab"]
+            if tab in section_tasks
+        ]
         report, markdown = await generator.generate_and_save(
             results["posts_by_tab"],
             results["summaries_by_tab"],
             results["tab_stats"],
-            storage
+            storage,
+            tab_sections=tab_sections
         )
         
         # Use storage.reports_path (attribute, not method)
@@ -241,6 +511,11 @@ def main(
         4,
         "--concurrent", "-c",
         help="Number of tabs to crawl concurrently"
+    ),
+    quiet: bool = typer.Option(
+        False,
+        "--quiet", "-q",
+        help="Suppress console output (logging is unaffected)"
     )
 ):
     """
@@ -260,12 +535,15 @@ def main(
     if ctx.invoked_subcommand is not None:
         return
     
-    # Display banner
-    console.print(Panel.fit(
-        "[bold cyan]Xueqiu Investor Discussion Crawler[/bold cyan]\n"
-        "AI & Alt Data Team - Linq 2025",
-        border_style="cyan"
-    ))
+    console.quiet = quiet
+    
+    # Display banner (decorative panels and tables only on a terminal)
+    if console.is_terminal:
+        console.print(Panel.fit(
+            "[bold cyan]Xueqiu Investor Discussion Crawler[/bold cyan]\n"
+            "AI & Alt Data Team - Linq 2025",
+            border_style="cyan"
+        ))
     
     # Check environment
     cookie_status = "Set ✓" if os.environ.get("XUEQIU_COOKIE") else "Not set"
@@ -302,21 +580,24 @@ def main(
         sys.exit(1)
     
     # Display configuration
-    config_table = Table(title="Configuration", show_header=False)
-    config_table.add_column("Setting", style="cyan")
-    config_table.add_column("Value", style="green")
-    config_table.add_row("Job Name", settings.job_name)
-    config_table.add_row("Output Directory", str(settings.get_storage_path()))
-    config_table.add_row("Tabs", ", ".join(t.value for t in parsed_tabs))
-    config_table.add_row("Max Posts/Tab", str(max_posts))
-    config_table.add_row("Concurrent Tabs", str(concurrent_tabs))
-    config_table.add_row("LLM Enabled", "No" if no_llm else ("Yes" if settings.llm.api_key else "Fallback"))
-    config_table.add_row("Cookie", cookie_status)
-    config_table.add_row("Playwright", playwright_status)
-    console.print(config_table)
-    console.print()
+    if console.is_terminal:
+        config_table = Table(title="Configuration", show_header=False)
+        config_table.add_column("Setting", style="cyan")
+        config_table.add_column("Value", style="green")
+        config_table.add_row("Job Name", settings.job_name)
+        config_table.add_row("Output Directory", str(settings.get_storage_path()))
+        config_table.add_row("Tabs", ", ".join(t.value for t in parsed_tabs))
+        config_table.add_row("Max Posts/Tab", str(max_posts))
+        config_table.add_row("Concurrent Tabs", str(concurrent_tabs))
+        config_table.add_row("LLM Enabled", "No" if no_llm else ("Yes" if settings.llm.api_key else "Fallback"))
+        config_table.add_row("Cookie", cookie_status)
+        config_table.add_row("Playwright", playwright_status)
+        console.print(config_table)
+        console.print()
     
     # Initialize storage
+    from src.storage import StorageManager, IncrementalSaver
+    
     storage = StorageManager(settings)
     saver = IncrementalSaver(storage, settings.storage.save_interval)
     
@@ -338,28 +619,37 @@ def main(
         total_posts = sum(len(posts) for posts in results["posts_by_tab"].values())
         total_summaries = sum(len(s) for s in results["summaries_by_tab"].values())
         
-        summary_table = Table(title="Crawl Summary")
-        summary_table.add_column("Metric", style="cyan")
-        summary_table.add_column("Value", style="green")
-        summary_table.add_row("Total Posts", str(total_posts))
-        summary_table.add_row("Total Summaries", str(total_summaries))
-        summary_table.add_row("Tabs Crawled", str(len(results["posts_by_tab"])))
-        summary_table.add_row("Duration", f"{duration:.1f} seconds")
-        summary_table.add_row("Errors", str(len(results["errors"])))
-        
-        console.print()
-        console.print(summary_table)
-        console.print()
-        
-        # Display output paths
-        console.print(Panel(
-            f"[bold green]✅ Pipeline Complete![/bold green]\n\n"
-            f"Raw Data: {settings.get_raw_path()}\n"
-            f"Summaries: {settings.get_summary_path()}\n"
-            f"Report: {settings.get_reports_path() / settings.storage.report_filename}",
-            title="Output Files",
-            border_style="green"
-        ))
+        if console.is_terminal:
+            summary_table = Table(title="Crawl Summary")
+            summary_table.add_column("Metric", style="cyan")
+            summary_table.add_column("Value", style="green")
+            summary_table.add_row("Total Posts", str(total_posts))
+            summary_table.add_row("Total Summaries", str(total_summaries))
+            summary_table.add_row("Tabs Crawled", str(len(results["posts_by_tab"])))
+            summary_table.add_row("Duration", f"{duration:.1f} seconds")
+            summary_table.add_row("Errors", str(len(results["errors"])))
+            
+            console.print()
+            console.print(summary_table)
+            console.print()
+            
+            # Display output paths
+            console.print(Panel(
+                f"[bold green]✅ Pipeline Complete![/bold green]\n\n"
+                f"Raw Data: {settings.get_raw_path()}\n"
+                f"Summaries: {settings.get_summary_path()}\n"
+                f"Report: {settings.get_reports_path() / settings.storage.report_filename}",
+                title="Output Files",
+                border_style="green"
+            ))
+        else:
+            console.print(
+                f"Pipeline complete: {total_posts} posts, {total_summaries} summaries "
+                f"in {duration:.1f}s. Report: "
+                f"{settings.get_reports_path() / settings.storage.report_filename}",
+                highlight=False,
+                markup=False
+            )
         
     except KeyboardInterrupt:
         console.print("\n[yellow]⚠️ Interrupted by user[/yellow]")
@@ -378,19 +668,8 @@ def list_tabs():
     table.add_column("Tab Name", style="cyan")
     table.add_column("Description", style="green")
     
-    descriptions = {
-        "热门": "Hot/Trending Discussions",
-        "7x24": "24/7 Live News & Updates",
-        "视频": "Video Content",
-        "基金": "Mutual Funds Discussions",
-        "资讯": "News & Information",
-        "达人": "Expert/Influencer Posts",
-        "私募": "Private Equity Discussions",
-        "ETF": "ETF Discussions"
-    }
-    
-    for tab in TabName:
-        table.add_row(tab.value, descriptions.get(tab.value, ""))
+    for tab, description in _TAB_DESCRIPTIONS:
+        table.add_row(tab.value, description)
     
     console.print(table)
 
@@ -8,27 +8,56 @@ and generates structured sentiment reports for hedge fund analysts.
 __version__ = "1.0.0"
 __author__ = "AI & Alt Data Team"
 
-from .config import (
-    AppSettings,
-    CrawlerSettings,
-    LLMSettings,
-    StorageSettings,
-    TabName,
-    load_settings,
-)
-from .models import (
-    CrawlReport,
-    PostData,
-    PostSummary,
-    SentimentType,
-    StockMention,
-    TabStatistics,
-    ThemeAnalysis,
-)
-from .crawler import XueqiuCrawler
-from .llm_summarizer import LLMSummarizer, BatchSummarizer, MockLLMSummarizer
-from .report_generator import ReportGenerator
-from .storage import StorageManager, IncrementalSaver
+import importlib
+
+# Public names and the submodule that defines each. Submodules are only
+# imported on first attribute access (PEP 562), so importing e.g.
+# src.config does not pull in Playwright, OpenAI, or the storage stack.
+_LAZY_EXPORTS = {
+    # Settings
+    "AppSettings": ".config",
+    "CrawlerSettings": ".config",
+    "LLMSettings": ".config",
+    "StorageSettings": ".config",
+    "TabName": ".config",
+    "load_settings": ".config",
+    # Models
+    "CrawlReport": ".models",
+    "PostData": ".models",
+    "PostSummary": ".models",
+    "SentimentType": ".models",
+    "StockMention": ".models",
+    "TabStatistics": ".models",
+    "ThemeAnalysis": ".models",
+    # Crawler
+    "XueqiuCrawler": ".crawler",
+    # LLM
+    "LLMSummarizer": ".llm_summarizer",
+    "BatchSummarizer": ".llm_summarizer",
+    "MockLLMSummarizer": ".llm_summarizer",
+    # Report
+    "ReportGenerator": ".report_generator",
+    # Storage
+    "StorageManager": ".storage",
+    "IncrementalSaver": ".storage",
+    # Cache
+    "SummaryCache": ".summary_cache",
+}
+
+
+def __getattr__(name):
+    """Import the defining submodule on first access to a public name."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     # Settings
@@ -57,4 +86,6 @@ __all__ = [
     # Storage
     "StorageManager",
     "IncrementalSaver",
+    # Cache
+    "SummaryCache",
 ]
\ No newline at end of file
@@ -3,15 +3,29 @@ Configuration module for Xueqiu Crawler.
 Handles all settings, constants, and environment variables.
 """
 
+import functools
 import os
+import re
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 
 from pydantic import ConfigDict, Field
 from pydantic_settings import BaseSettings
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Linear-time RE2 engine for the hot text scans when google-re2 is
+# installed; it mirrors the re API, so the stdlib is a drop-in fallback
+try:
+    import re2 as regex_engine
+except ImportError:
+    regex_engine = re
+
 
 class TabName(str, Enum):
     """Available tabs on Xueqiu homepage."""
@@ -25,6 +39,9 @@ class TabName(str, Enum):
     ETF = "ETF"          # ETF
 
 
+# Tab lookup by display name; a plain dict avoids the Enum call machinery
+TAB_BY_VALUE = {tab.value: tab for tab in TabName}
+
 # Tab URL mappings for Xueqiu
 TAB_URL_MAPPING = {
     TabName.REMEN: "https://xueqiu.com/",
@@ -68,6 +85,9 @@ class CrawlerSettings(BaseSettings):
     max_concurrent_tabs: int = Field(default=4, ge=1)
     request_delay: float = Field(default=0.5, ge=0.1)
     
+    # Open a fresh browser context after this many posts to bound memory
+    context_recycle_posts: int = Field(default=100, ge=1)
+    
     # Browser settings
     headless: bool = False
     user_agent: str = (
@@ -95,10 +115,21 @@ class LLMSettings(BaseSettings):
     requests_per_minute: int = Field(default=5, ge=1)
     max_concurrent_requests: int = Field(default=1, ge=1)
     
+    # Posts packed into a single summarization request
+    pack_size: int = Field(default=8, ge=1)
+    
     # Retry settings
     retry_attempts: int = Field(default=5, ge=1)
     retry_delay: float = Field(default=10.0, ge=0.1)
     
+    # Provider-side prompt cache key for the shared system prompt ("" disables)
+    prompt_cache_key: str = "xueqiu_sys_v1"
+    
+    # Summary cache settings
+    cache_enabled: bool = True
+    cache_embedding_model: str = "paraphrase-multilingual-MiniLM-L12-v2"
+    cache_similarity_threshold: float = Field(default=0.92, ge=0, le=1)
+    
     model_config = ConfigDict(env_prefix="FIREWORKS_")
 
 
@@ -111,6 +142,7 @@ class StorageSettings(BaseSettings):
     raw_dir: str = "raw"
     summary_dir: str = "summary"
     reports_dir: str = "reports"
+    cache_dir: str = "cache"
     
     # File naming
     raw_file_prefix: str = "posts_"
@@ -162,6 +194,10 @@ class AppSettings(BaseSettings):
     def get_reports_path(self) -> Path:
         """Get the reports storage path."""
         return self.get_storage_path() / self.storage.reports_dir
+    
+    def get_cache_path(self) -> Path:
+        """Get the summary cache path (shared across jobs)."""
+        return self.storage.base_dir / self.storage.cache_dir
 
 
 # Stock symbol patterns for Chinese markets
@@ -174,6 +210,13 @@ STOCK_SYMBOL_PATTERNS = [
     r'\$([A-Z\d]{1,6})\(([A-Z]{2}\d+)\)\$',  # Complex format
 ]
 
+# Symbol patterns compiled once, case-insensitive. They stay separate
+# scans: a single alternation only reports leftmost, non-overlapping
+# matches, which drops symbols whose text overlaps (e.g. "SH600519.SH").
+STOCK_SYMBOL_REGEXES = tuple(
+    regex_engine.compile(f"(?i){p}") for p in STOCK_SYMBOL_PATTERNS
+)
+
 # Sentiment keywords for basic classification (Chinese)
 SENTIMENT_KEYWORDS = {
     "positive": [
@@ -204,10 +247,143 @@ SECTOR_KEYWORDS = {
 }
 
 
-def load_settings() -> AppSettings:
-    """Load application settings from environment and defaults."""
+def _build_keyword_automaton(keyword_map: Dict[str, List[str]]):
+    """
+    Build an Aho-Corasick automaton mapping each keyword to its labels.
+    
+    Args:
+        keyword_map: Dictionary mapping labels to keyword lists
+        
+    Returns:
+        Automaton, or None if pyahocorasick is not installed
+    """
+    if ahocorasick is None:
+        return None
+    
+    labels_by_keyword: Dict[str, List[str]] = {}
+    for label, keywords in keyword_map.items():
+        for keyword in keywords:
+            labels_by_keyword.setdefault(keyword, []).append(label)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, labels in labels_by_keyword.items():
+        automaton.add_word(keyword, (keyword, tuple(labels)))
+    automaton.make_automaton()
+    return automaton
+
+
+# Sentiment classes in the order count_sentiment reports them
+SENTIMENT_CLASSES = ("positive", "negative", "neutral")
+
+# The sentiment keywords are all Chinese, which has no case, so text only
+# needs lowercasing (a full copy of the post) if a cased keyword is added
+_SENTIMENT_HAS_CASE = any(
+    keyword.lower() != keyword.upper()
+    for keywords in SENTIMENT_KEYWORDS.values()
+    for keyword in keywords
+)
+
+# Lowercased keyword lists per class, for scans without pyahocorasick
+_SENTIMENT_KEYWORD_LISTS = tuple(
+    [keyword.lower() for keyword in SENTIMENT_KEYWORDS[label]]
+    for label in SENTIMENT_CLASSES
+)
+
+
+def _build_sentiment_automaton():
+    """
+    Build an automaton whose payloads carry sentiment class ids.
+    
+    Each keyword maps to (keyword_id, class_ids) so counting is plain
+    list indexing instead of label lookups.
+    
+    Returns:
+        Automaton, or None if pyahocorasick is not installed
+    """
+    if ahocorasick is None:
+        return None
+    
+    class_ids_by_keyword: Dict[str, List[int]] = {}
+    for class_id, label in enumerate(SENTIMENT_CLASSES):
+        for keyword in SENTIMENT_KEYWORDS[label]:
+            class_ids_by_keyword.setdefault(keyword.lower(), []).append(class_id)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword_id, (keyword, class_ids) in enumerate(class_ids_by_keyword.items()):
+        automaton.add_word(keyword, (keyword_id, tuple(class_ids)))
+    automaton.make_automaton()
+    return automaton
+
+
+# Keyword automata, built once at import when pyahocorasick is available
+SENTIMENT_AUTOMATON = _build_sentiment_automaton()
+SECTOR_AUTOMATON = _build_keyword_automaton(SECTOR_KEYWORDS)
+
+
+def count_sentiment(text: str) -> List[int]:
+    """
+    Count distinct sentiment keywords per class in a single pass.
+    
+    Matching is case-insensitive.
+    
+    Args:
+        text: Text to scan
+        
+    Returns:
+        [positive, negative, neutral] keyword counts
+    """
+    if _SENTIMENT_HAS_CASE:
+        text = text.lower()
+    
+    if SENTIMENT_AUTOMATON is None:
+        # map() keeps the substring tests in C
+        return [sum(map(text.__contains__, keywords)) for keywords in _SENTIMENT_KEYWORD_LISTS]
+    
+    counts = [0, 0, 0]
+    seen: Set[int] = set()
+    for _, (keyword_id, class_ids) in SENTIMENT_AUTOMATON.iter(text):
+        if keyword_id not in seen:
+            seen.add(keyword_id)
+            for class_id in class_ids:
+                counts[class_id] += 1
+    return counts
+
+
+def extract_sectors(text: str) -> Set[str]:
+    """
+    Find sectors whose keywords appear in text in a single pass.
+    
+    Args:
+        text: Text to scan
+        
+    Returns:
+        Set of sector names
+    """
+    if SECTOR_AUTOMATON is None:
+        return {
+            sector for sector, keywords in SECTOR_KEYWORDS.items()
+            if any(map(text.__contains__, keywords))
+        }
+    
+    # Membership only, so no per-keyword dedup or counting is needed
+    found: Set[str] = set()
+    for _, (_, sectors) in SECTOR_AUTOMATON.iter(text):
+        found.update(sectors)
+    return found
+
+
+@functools.lru_cache(maxsize=1)
+def _load_base_settings() -> AppSettings:
+    """Parse settings from environment once per process."""
     return AppSettings()
 
 
-# Global settings instance
-settings = load_settings()
\ No newline at end of file
+def load_settings() -> AppSettings:
+    """
+    Load application settings from environment and defaults.
+    
+    The environment is parsed only on the first call; later calls return
+    a deep copy of the cached settings so callers can override fields
+    (as main.py and the tests do) without affecting each other.
+    """
+    return _load_base_settings().model_copy(deep=True)
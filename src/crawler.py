@@ -5,6 +5,8 @@ Includes robust selector handling, modal closing, and concurrent tab crawling.
 """
 
 import asyncio
+import inspect
+import json
 import os
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional, Set
@@ -13,13 +15,119 @@ from .config import AppSettings, TabName, TAB_SELECTOR_MAPPING
 from .models import PostData, TabStatistics
 from .utils import (
     clean_text,
-    extract_stock_symbols,
-    extract_urls,
-    generate_content_hash,
+    generate_content_digest,
     get_logger,
+    scan_post_text,
 )
 
 
+# Maximum tabs crawled as pages of one shared browser context
+TABS_PER_CONTEXT = 5
+
+# Robust selectors for post elements
+POST_SELECTORS = (
+    "div[class*='AnonymousHome']",
+    "div[class*='timeline-live']",
+    "div[class*='TimelineItem_item_']",
+    ".timeline__item",
+    ".status-item",
+    "article",
+    "div.flow-item",
+    "div.feed-item",
+    "div[class*='item__']",
+)
+COMBINED_POST_SELECTOR = ", ".join(POST_SELECTORS)
+
+# Common selectors for Xueqiu login close buttons
+CLOSE_SELECTORS = (
+    ".modal__close",
+    "[class*='modal'] [class*='close']",
+    "a.close",
+    "[aria-label='Close']",
+)
+
+# Returns [total item count, texts of items not read before]. Items are
+# marked once read, so each scroll only ships newly loaded posts; items
+# still too short (not yet rendered) are left unmarked for a later pass.
+READ_NEW_ITEMS_JS = """(els) => {
+    const texts = [];
+    for (const e of els) {
+        if (e.dataset.xqRead) continue;
+        const t = e.innerText;
+        if (t.length >= 5) {
+            e.dataset.xqRead = "1";
+            texts.push(t);
+        }
+    }
+    return [els.length, texts];
+}"""
+
+# Returns the first selector with a visible match, or null
+FIND_VISIBLE_JS = """(sels) => {
+    for (const s of sels) {
+        const el = document.querySelector(s);
+        if (el && el.offsetParent !== null) return s;
+    }
+    return null;
+}"""
+
+# Reports a newly visible close button via window.onModalShown
+MODAL_OBSERVER_JS = """(sels) => {
+    let scheduled = false;
+    let reported = null;
+    const check = () => {
+        scheduled = false;
+        for (const s of sels) {
+            const el = document.querySelector(s);
+            if (el && el.offsetParent !== null) {
+                if (el !== reported) {
+                    reported = el;
+                    window.onModalShown(s);
+                }
+                return;
+            }
+        }
+        reported = null;
+    };
+    new MutationObserver(() => {
+        if (!scheduled) {
+            scheduled = true;
+            setTimeout(check, 100);
+        }
+    }).observe(document, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ["class", "style"]
+    });
+}"""
+
+
+class _StacklessInspect:
+    """Stand-in for the inspect module that skips call-stack capture."""
+    
+    @staticmethod
+    def stack(context: int = 1) -> list:
+        return []
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(inspect, name)
+
+
+def _disable_playwright_stack_capture():
+    """
+    Stop Playwright from calling inspect.stack() on every API call.
+    
+    Playwright captures the full Python stack for error messages on each
+    locator/click/evaluate, which dominates CPU on long crawls. Set
+    PW_INSPECT_STACK=1 to keep the original behaviour when debugging.
+    """
+    if os.environ.get("PW_INSPECT_STACK", "0") != "0":
+        return
+    try:
+        from playwright._impl import _connection
+    except ImportError:
+        return
+    _connection.inspect = _StacklessInspect()
+
+
 class XueqiuCrawler:
     """
     Asynchronous crawler for Xueqiu investor discussions.
@@ -36,13 +144,20 @@ class XueqiuCrawler:
         self.settings = settings
         self.logger = get_logger("crawler")
         self._stats: Dict[str, TabStatistics] = {}
-        self._seen_ids: Set[str] = set()
+        # 64-bit post digests, far smaller than a set of hex strings
+        self._seen_ids: Set[int] = set()
         self._post_callback: Optional[Callable] = None
         
+        # Shared Playwright browser, launched on first use
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+        
         # Check Playwright availability
         try:
             import playwright
             self._playwright_available = True
+            _disable_playwright_stack_capture()
         except ImportError:
             self._playwright_available = False
             self.logger.warning(
@@ -56,16 +171,84 @@ class XueqiuCrawler:
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        pass
+        await self.close()
         
     async def close(self):
         """Close any open resources."""
-        pass
+        async with self._browser_lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+    
+    async def _ensure_browser(self):
+        """
+        Launch the shared browser if it is not running yet.
+        
+        Must be called with _browser_lock held.
+        
+        Returns:
+            Playwright browser instance
+        """
+        if self._browser is None:
+            from playwright.async_api import async_playwright
+            
+            self._playwright = await async_playwright().start()
+            # Launch browser with anti-detection settings
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.settings.crawler.headless,
+                args=["--disable-blink-features=AutomationControlled"]
+            )
+        return self._browser
+    
+    async def _new_context(self, storage_state: Optional[Dict[str, Any]] = None):
+        """
+        Open a fresh browser context on the shared browser.
+        
+        Args:
+            storage_state: Optional cookies/local storage from a previous
+                context; environment cookies are applied when omitted
+        
+        Returns:
+            Playwright browser context with cookies applied
+        """
+        # Serialize creation so concurrent tabs never race the browser launch
+        async with self._browser_lock:
+            browser = await self._ensure_browser()
+            context = await browser.new_context(
+                user_agent=self.settings.crawler.user_agent,
+                viewport={"width": 1366, "height": 768},
+                storage_state=storage_state
+            )
+        
+        # Add cookies if available from environment
+        cookie_str = os.environ.get("XUEQIU_COOKIE")
+        if cookie_str and storage_state is None:
+            cookies = []
+            for item in cookie_str.split(";"):
+                if "=" in item:
+                    k, v = item.strip().split("=", 1)
+                    cookies.append({
+                        "name": k, 
+                        "value": v, 
+                        "domain": ".xueqiu.com", 
+                        "path": "/"
+                    })
+            if cookies:
+                await context.add_cookies(cookies)
+                self.logger.info("Added cookies from environment")
+        
+        return context
     
     def set_post_callback(self, callback: Callable):
         """
         Set callback function for processing posts.
         
+        The callback is awaited after every scroll that yields new posts,
+        so a slow callback applies backpressure to the crawl.
+        
         Args:
             callback: Async function to call with each batch of posts
         """
@@ -74,7 +257,8 @@ class XueqiuCrawler:
     async def crawl_tab(
         self, 
         tab: TabName, 
-        max_posts: Optional[int] = None
+        max_posts: Optional[int] = None,
+        context=None
     ) -> List[PostData]:
         """
         Crawl posts from a single tab using Playwright.
@@ -82,6 +266,7 @@ class XueqiuCrawler:
         Args:
             tab: Tab to crawl
             max_posts: Maximum posts to collect
+            context: Optional shared browser context to crawl in
             
         Returns:
             List of collected posts
@@ -91,39 +276,32 @@ class XueqiuCrawler:
         
         self.logger.info(f"Starting crawl for tab '{tab_name}' using Playwright...")
         
-        # Initialize statistics
-        self._stats[tab_name] = TabStatistics(
-            tab_name=tab_name,
-            total_posts=0,
-            valid_posts=0,
-            duplicate_posts=0
-        )
-        
         start_time = datetime.utcnow()
         posts = []
+        errors_count = 0
         
         try:
             if self._playwright_available:
-                posts = await self._crawl_tab_via_playwright(tab, max_posts)
+                posts = await self._crawl_tab_via_playwright(tab, max_posts, context)
             else:
                 self.logger.error(
                     "Playwright is required but not installed. "
                     "Run: pip install playwright && playwright install chromium"
                 )
-            
-            # Call callback if set (for incremental saving)
-            if self._post_callback and posts:
-                await self._post_callback(tab_name, posts)
                 
         except Exception as e:
             self.logger.error(f"Error crawling {tab_name}: {e}")
-            self._stats[tab_name].errors_count += 1
+            errors_count += 1
         
-        # Update statistics
+        # Record statistics in a single model construction
         end_time = datetime.utcnow()
-        self._stats[tab_name].total_posts = len(posts)
-        self._stats[tab_name].valid_posts = len(posts)
-        self._stats[tab_name].crawl_duration_seconds = (end_time - start_time).total_seconds()
+        self._stats[tab_name] = TabStatistics(
+            tab_name=tab_name,
+            total_posts=len(posts),
+            valid_posts=len(posts),
+            crawl_duration_seconds=(end_time - start_time).total_seconds(),
+            errors_count=errors_count
+        )
         
         self.logger.info(
             f"Completed crawl for {tab_name}: {len(posts)} posts in "
@@ -140,26 +318,171 @@ class XueqiuCrawler:
             page: Playwright page object
         """
         try:
-            # Common selectors for Xueqiu login close buttons
-            close_selectors = [
-                ".modal__close", 
-                "[class*='modal'] [class*='close']", 
-                "a.close",
-                "[aria-label='Close']"
-            ]
-            for selector in close_selectors:
-                if await page.locator(selector).is_visible(timeout=1000):
-                    self.logger.info("Closing login modal...")
-                    await page.click(selector)
-                    await page.wait_for_timeout(500)
-                    return
+            # Probe all close buttons in one round-trip
+            selector = await page.evaluate(FIND_VISIBLE_JS, list(CLOSE_SELECTORS))
+            if selector:
+                self.logger.info("Closing login modal...")
+                await page.click(selector)
+                await page.wait_for_selector(selector, state="hidden", timeout=1000)
         except Exception:
             pass
 
+    async def _wait_for_network_idle(self, page, timeout: int):
+        """
+        Wait until the page's network goes quiet, for at most timeout ms.
+        
+        Args:
+            page: Playwright page object
+            timeout: Maximum wait in milliseconds
+        """
+        try:
+            await page.wait_for_load_state("networkidle", timeout=timeout)
+        except Exception:
+            pass
+    
+    async def _wait_for_more_items(self, page, selector: str, count: int, timeout: int):
+        """
+        Wait until more than count elements match selector, for at most timeout ms.
+        
+        Args:
+            page: Playwright page object
+            selector: CSS selector for feed items
+            count: Number of items matched before scrolling
+            timeout: Maximum wait in milliseconds
+        """
+        try:
+            await page.wait_for_function(
+                "([sel, n]) => document.querySelectorAll(sel).length > n",
+                arg=[selector, count],
+                timeout=timeout
+            )
+        except Exception:
+            pass
+    
+    async def _open_tab_page(self, context, tab: TabName):
+        """
+        Open a page in the context and navigate to a tab's feed.
+        
+        Args:
+            context: Playwright browser context
+            tab: Tab to open
+            
+        Returns:
+            Playwright page showing the tab
+        """
+        tab_name = tab.value
+        page = await context.new_page()
+        await self._watch_login_modal(page)
+        
+        # Navigate to homepage
+        self.logger.info(f"[{tab_name}] Navigating to homepage...")
+        await page.goto(
+            "https://xueqiu.com/", 
+            wait_until="domcontentloaded", 
+            timeout=60000
+        )
+        await self._wait_for_network_idle(page, 3000)  # Initial load wait
+        
+        # Handle initial popup
+        await self._handle_login_modal(page)
+        
+        # Click on target tab
+        try:
+            self.logger.info(f"[{tab_name}] Clicking tab...")
+            # Try clicking by text first
+            tab_locator = page.locator(f"//a[contains(text(), '{tab_name}')]")
+            if await tab_locator.count() > 0:
+                await tab_locator.first.click()
+            else:
+                # Fallback to data-type selector
+                selector = TAB_SELECTOR_MAPPING.get(tab)
+                if selector:
+                    await page.click(selector)
+            
+            await self._wait_for_network_idle(page, 2000)
+            
+        except Exception as e:
+            self.logger.warning(
+                f"[{tab_name}] Tab click issue: {e}. Trying to crawl anyway."
+            )
+        
+        return page
+    
+    async def _reopen_tab_page(self, context, tab: TabName):
+        """
+        Open a fresh page on a tab and scroll back past already-seen posts.
+        
+        Args:
+            context: Playwright browser context
+            tab: Tab being crawled
+            
+        Returns:
+            Playwright page showing the tab
+        """
+        page = await self._open_tab_page(context, tab)
+        for _ in range(3):
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await self._wait_for_network_idle(page, 1000)
+        return page
+    
+    async def _recycle_context(self, context, page, tab: TabName):
+        """
+        Replace a long-lived context with a fresh one to release its memory.
+        
+        Cookies and local storage carry over via storage_state, and the new
+        page is scrolled down a few screens to get back past seen posts.
+        
+        Args:
+            context: Current Playwright browser context
+            page: Current page in that context
+            tab: Tab being crawled
+            
+        Returns:
+            Tuple of (new context, new page)
+        """
+        state = await context.storage_state()
+        await page.close()
+        await context.close()
+        
+        context = await self._new_context(storage_state=state)
+        page = await self._reopen_tab_page(context, tab)
+        return context, page
+    
+    async def _watch_login_modal(self, page):
+        """
+        Close login modals as soon as the page shows them.
+        
+        Installs a MutationObserver in every document the page loads, which
+        reports visible close buttons back to a background task that clicks
+        them, so the scroll loop never has to poll for modals.
+        
+        Args:
+            page: Playwright page object, before navigation
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        await page.expose_function("onModalShown", queue.put_nowait)
+        await page.add_init_script(
+            f"({MODAL_OBSERVER_JS})({json.dumps(list(CLOSE_SELECTORS))})"
+        )
+        
+        async def close_modals():
+            while True:
+                selector = await queue.get()
+                try:
+                    self.logger.info("Closing login modal...")
+                    await page.click(selector, timeout=1000)
+                    await page.wait_for_selector(selector, state="hidden", timeout=1000)
+                except Exception:
+                    pass
+        
+        task = asyncio.create_task(close_modals())
+        page.on("close", lambda _: task.cancel())
+    
     async def _crawl_tab_via_playwright(
         self, 
         tab: TabName, 
-        max_posts: int
+        max_posts: int,
+        context=None
     ) -> List[PostData]:
         """
         Crawl tab using Playwright browser automation.
@@ -167,129 +490,61 @@ class XueqiuCrawler:
         Args:
             tab: Tab to crawl
             max_posts: Maximum posts to collect
+            context: Shared browser context to open the tab's page in;
+                a private context is created (and closed) when omitted
             
         Returns:
             List of collected posts
         """
         tab_name = tab.value
         posts = []
+        own_context = context is None
         
         try:
-            from playwright.async_api import async_playwright
-            
-            async with async_playwright() as p:
-                # Launch browser with anti-detection settings
-                browser = await p.chromium.launch(
-                    headless=self.settings.crawler.headless,
-                    args=["--disable-blink-features=AutomationControlled"]
-                )
-                
-                context = await browser.new_context(
-                    user_agent=self.settings.crawler.user_agent,
-                    viewport={"width": 1366, "height": 768}
-                )
-                
-                # Add cookies if available from environment
-                cookie_str = os.environ.get("XUEQIU_COOKIE")
-                if cookie_str:
-                    cookies = []
-                    for item in cookie_str.split(";"):
-                        if "=" in item:
-                            k, v = item.strip().split("=", 1)
-                            cookies.append({
-                                "name": k, 
-                                "value": v, 
-                                "domain": ".xueqiu.com", 
-                                "path": "/"
-                            })
-                    if cookies:
-                        await context.add_cookies(cookies)
-                        self.logger.info("Added cookies from environment")
-
-                page = await context.new_page()
-                
-                # Navigate to homepage
-                self.logger.info(f"[{tab_name}] Navigating to homepage...")
-                await page.goto(
-                    "https://xueqiu.com/", 
-                    wait_until="domcontentloaded", 
-                    timeout=60000
-                )
-                await page.wait_for_timeout(3000)  # Initial load wait
-                
-                # Handle initial popup
-                await self._handle_login_modal(page)
+            if own_context:
+                context = await self._new_context()
+            page = None
+            try:
+                page = await self._open_tab_page(context, tab)
                 
-                # Click on target tab
-                try:
-                    self.logger.info(f"[{tab_name}] Clicking tab...")
-                    # Try clicking by text first
-                    tab_locator = page.locator(f"//a[contains(text(), '{tab_name}')]")
-                    if await tab_locator.count() > 0:
-                        await tab_locator.first.click()
-                    else:
-                        # Fallback to data-type selector
-                        selector = TAB_SELECTOR_MAPPING.get(tab)
-                        if selector:
-                            await page.click(selector)
-                    
-                    await page.wait_for_timeout(2000)
-                    
-                except Exception as e:
-                    self.logger.warning(
-                        f"[{tab_name}] Tab click issue: {e}. Trying to crawl anyway."
-                    )
-
                 # Scroll and collect posts
                 scroll_count = 0
                 max_scrolls = (max_posts // 5) + 10  # Extra scrolls for safety
                 no_new_content_count = 0
-                
-                # Robust selectors for post elements
-                post_selectors = [
-                    "div[class*='AnonymousHome']", 
-                    "div[class*='timeline-live']",
-                    "div[class*='TimelineItem_item_']", 
-                    ".timeline__item",
-                    ".status-item",
-                    "article",
-                    "div.flow-item",       
-                    "div.feed-item",       
-                    "div[class*='item__']" 
-                ]
-                combined_selector = ", ".join(post_selectors)
+                recycle_every = self.settings.crawler.context_recycle_posts
+                posts_since_recycle = 0
                 
                 while len(posts) < max_posts and scroll_count < max_scrolls:
                     # Wait for items to be present
                     try:
-                        await page.wait_for_selector(combined_selector, timeout=3000)
+                        await page.wait_for_selector(COMBINED_POST_SELECTOR, timeout=3000)
                     except Exception:
                         self.logger.debug(f"[{tab_name}] Waiting for content...")
 
-                    items = await page.locator(combined_selector).all()
+                    # Read new items' text in a single driver round-trip
+                    item_count, texts = await page.eval_on_selector_all(
+                        COMBINED_POST_SELECTOR, READ_NEW_ITEMS_JS
+                    )
                     
-                    if not items:
+                    if not item_count:
                         self.logger.warning(f"[{tab_name}] No items found on screen.")
                     
                     current_batch_count = len(posts)
                     
-                    for item in items:
+                    for text in texts:
                         if len(posts) >= max_posts:
                             break
                         
                         try:
-                            # Extract text content
-                            text = await item.inner_text()
-                            if len(text) < 5:
-                                continue  # Too short
-                            
                             text = clean_text(text)
-                            post_id = generate_content_hash(text)[:16]
+                            digest = generate_content_digest(text)
                             
                             # Skip duplicates
-                            if post_id in self._seen_ids:
+                            if digest in self._seen_ids:
                                 continue
-                            self._seen_ids.add(post_id)
+                            self._seen_ids.add(digest)
+                            post_id = f"{digest:016x}"
+                            symbols, urls = scan_post_text(text)
                             
                             # Create PostData object
                             post = PostData(
@@ -298,8 +553,8 @@ class XueqiuCrawler:
                                 html="",
                                 timestamp=datetime.utcnow(),
                                 tab=tab_name,
-                                symbols=extract_stock_symbols(text),
-                                urls=extract_urls(text)
+                                symbols=symbols,
+                                urls=urls
                             )
                             
                             if post.is_valid():
@@ -308,10 +563,15 @@ class XueqiuCrawler:
                         except Exception:
                             continue
                     
+                    # Hand this scroll's posts downstream (saving, summarizing)
+                    # while the crawl continues
+                    if self._post_callback and len(posts) > current_batch_count:
+                        await self._post_callback(tab_name, posts[current_batch_count:])
+                    
                     # Scroll down
-                    await self._handle_login_modal(page)  # Check for modal again
                     await page.evaluate("window.scrollBy(0, 1000)")
-                    await page.wait_for_timeout(2000)  # Wait for infinite scroll loading
+                    # Wait for infinite scroll loading
+                    await self._wait_for_more_items(page, COMBINED_POST_SELECTOR, item_count, 2000)
                     
                     # Check progress
                     if len(posts) == current_batch_count:
@@ -328,8 +588,26 @@ class XueqiuCrawler:
                         
                     scroll_count += 1
                     self.logger.info(f"[{tab_name}] Collected {len(posts)} posts so far...")
+                    
+                    # Recycle periodically to bound browser memory; a shared
+                    # context stays up for other tabs, so only the page is
+                    # renewed here and crawl_tabs recycles it once idle
+                    posts_since_recycle += len(posts) - current_batch_count
+                    if posts_since_recycle >= recycle_every and len(posts) < max_posts:
+                        self.logger.info(f"[{tab_name}] Recycling browser context...")
+                        if own_context:
+                            context, page = await self._recycle_context(context, page, tab)
+                        else:
+                            await page.close()
+                            page = None
+                            page = await self._reopen_tab_page(context, tab)
+                        posts_since_recycle = 0
                 
-                await browser.close()
+            finally:
+                if own_context:
+                    await context.close()
+                elif page is not None:
+                    await page.close()
                 
         except Exception as e:
             self.logger.error(f"Playwright crawl error for {tab_name}: {e}")
@@ -339,7 +617,8 @@ class XueqiuCrawler:
     async def crawl_tabs(
         self, 
         tabs: List[TabName], 
-        max_posts_per_tab: Optional[int] = None
+        max_posts_per_tab: Optional[int] = None,
+        on_tab_complete: Optional[Callable[[str], None]] = None
     ) -> Dict[str, List[PostData]]:
         """
         Crawl multiple tabs concurrently.
@@ -347,21 +626,77 @@ class XueqiuCrawler:
         Args:
             tabs: List of tabs to crawl
             max_posts_per_tab: Maximum posts per tab
+            on_tab_complete: Optional function called with each tab name
+                as soon as that tab finishes (e.g. to advance a progress bar)
             
         Returns:
             Dictionary mapping tab names to posts
         """
         self.logger.info(f"Starting concurrent crawl for {len(tabs)} tabs")
         
-        # Create semaphore for concurrency control
-        semaphore = asyncio.Semaphore(self.settings.crawler.max_concurrent_tabs)
+        # Pool of page slots over a few shared contexts: each context hosts at
+        # most TABS_PER_CONTEXT tabs, and the pool size bounds concurrency
+        concurrency = self.settings.crawler.max_concurrent_tabs
+        contexts: List[Any] = [None] * -(-concurrency // TABS_PER_CONTEXT)
+        context_lock = asyncio.Lock()
+        slots: asyncio.Queue = asyncio.Queue()
+        for i in range(concurrency):
+            slots.put_nowait(i % len(contexts))
+        
+        # Per context: tabs crawling in it, posts it has served, and the
+        # cookies/local storage carried over from the context it replaced
+        active = [0] * len(contexts)
+        served = [0] * len(contexts)
+        states: List[Optional[Dict[str, Any]]] = [None] * len(contexts)
+        recycle_every = self.settings.crawler.context_recycle_posts
         
-        async def crawl_with_semaphore(tab: TabName):
-            async with semaphore:
-                return await self.crawl_tab(tab, max_posts_per_tab)
+        async def get_context(index: int):
+            if not self._playwright_available:
+                return None
+            async with context_lock:
+                if contexts[index] is None:
+                    contexts[index] = await self._new_context(storage_state=states[index])
+                active[index] += 1
+            return contexts[index]
+        
+        async def release_context(index: int, post_count: int):
+            # A shared context is only recycled once no tab is using it
+            async with context_lock:
+                active[index] -= 1
+                served[index] += post_count
+                if active[index] or served[index] < recycle_every:
+                    return
+                
+                context, contexts[index] = contexts[index], None
+                served[index] = 0
+                self.logger.info("Recycling idle browser context...")
+                try:
+                    states[index] = await context.storage_state()
+                finally:
+                    await context.close()
+        
+        async def crawl_in_slot(tab: TabName):
+            index = await slots.get()
+            context = None
+            posts: List[PostData] = []
+            try:
+                context = await get_context(index)
+                posts = await self.crawl_tab(tab, max_posts_per_tab, context)
+                return posts
+            finally:
+                if context is not None:
+                    await release_context(index, len(posts))
+                slots.put_nowait(index)
+                if on_tab_complete:
+                    on_tab_complete(tab.value)
 
-        tasks = [crawl_with_semaphore(tab) for tab in tabs]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        tasks = [crawl_in_slot(tab) for tab in tabs]
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for context in contexts:
+                if context is not None:
+                    await context.close()
         
         # Process results
         all_posts = {}
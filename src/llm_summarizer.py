@@ -4,10 +4,13 @@ Uses Fireworks AI API with OpenAI SDK for post summarization and entity extracti
 """
 
 import asyncio
-import json
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
+import httpx
+import orjson
 from openai import AsyncOpenAI, APIError, RateLimitError, APITimeoutError
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -15,10 +18,12 @@ from tenacity import (
     wait_exponential,
 )
 
-from .config import AppSettings
+from .config import AppSettings, LLMSettings
 from .models import PostData, PostSummary, SentimentType
+from .summary_cache import SummaryCache
 from .utils import (
     classify_sentiment_basic,
+    classify_sentiment_batch,
     get_logger,
     identify_sectors,
     truncate_text,
@@ -61,31 +66,172 @@ Important Constraints:
 - Do not hallucinate or add information not present in the original post."""
 
 
+# System prompt for packing several posts into one LLM request
+BATCH_SUMMARIZATION_PROMPT = """You are an expert financial analyst specializing in Chinese stock markets. 
+Analyze each of the following investor discussion posts from Xueqiu (雪球), a Chinese social investing platform.
+
+Your task is to extract insights for EVERY post and output them STRICTLY IN ENGLISH.
+
+Each post is introduced by a line of the form "[post_id: <id>]". For each post:
+1. Provide a concise summary (1-2 sentences) IN ENGLISH.
+2. Extract key discussion points IN ENGLISH.
+3. Identify mentioned stock tickers (format: SH/SZ/HK + code).
+4. Identify company names (Translate Chinese names to English).
+5. Identify investment themes and sectors (Use standard English terms like "Technology", "Finance").
+6. Analyze sentiment (positive/neutral/negative) and provide reasoning IN ENGLISH.
+
+Respond in JSON format with the following structure, one entry per post:
+{
+    "summaries": [
+        {
+            "post_id": "<id copied exactly from the post header>",
+            "summary": "Brief summary of the post in English",
+            "key_points": ["Point 1 in English"],
+            "tickers": ["SH600519"],
+            "companies": ["Kweichow Moutai"],
+            "themes": ["Value Investing"],
+            "sectors": ["Consumption"],
+            "sentiment": "positive",
+            "sentiment_score": 0.8,
+            "sentiment_reasoning": "The author expresses optimism about... (in English)"
+        }
+    ]
+}
+
+Important Constraints:
+- OUTPUT LANGUAGE: ALL text fields MUST BE IN ENGLISH.
+- Return exactly one entry per post and copy each post_id verbatim.
+- If no stocks are mentioned, return empty arrays.
+- Sentiment score should be between -1.0 (very negative) and 1.0 (very positive).
+- Do not hallucinate or add information not present in the original posts."""
+
+# Approximate completion tokens needed per post in a batched response
+BATCH_TOKENS_PER_POST = 128
+
+# System messages are identical for every request, so build them once
+SYSTEM_MESSAGE = {"role": "system", "content": SUMMARIZATION_PROMPT}
+BATCH_SYSTEM_MESSAGE = {"role": "system", "content": BATCH_SUMMARIZATION_PROMPT}
+
+
+class LLMResponse(BaseModel):
+    """Analysis of one post as returned by the LLM."""
+    
+    summary: str = ""
+    key_points: List[str] = Field(default_factory=list)
+    tickers: List[str] = Field(default_factory=list)
+    companies: List[str] = Field(default_factory=list)
+    themes: List[str] = Field(default_factory=list)
+    sectors: List[str] = Field(default_factory=list)
+    sentiment: SentimentType = SentimentType.NEUTRAL
+    sentiment_score: float = 0.0
+    sentiment_reasoning: Optional[str] = None
+    
+    @field_validator("sentiment", mode="before")
+    @classmethod
+    def _coerce_sentiment(cls, value: Any) -> SentimentType:
+        """Accept any casing and treat unknown labels as neutral."""
+        try:
+            return SentimentType(str(value).lower())
+        except ValueError:
+            return SentimentType.NEUTRAL
+
+
+# Shared HTTP connection pool for Fireworks requests (see _get_http_client),
+# closed when the last summarizer using it closes
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_users = 0
+
+# Connection pool size; with HTTP/2 most requests share one connection
+HTTP_POOL_SIZE = 64
+
+
+def _get_http_client(llm_settings: LLMSettings) -> httpx.AsyncClient:
+    """
+    Get the shared keep-alive HTTP client, creating it if needed.
+    
+    HTTP/2 is used when the `h2` package is installed so concurrent
+    requests multiplex over one connection; otherwise the pool falls back
+    to HTTP/1.1 keep-alive. Transport-level retries are off because the
+    OpenAI client already retries failed requests.
+    
+    Args:
+        llm_settings: LLM settings (used to size the pool)
+        
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _http_client, _http_client_users
+    
+    _http_client_users += 1
+    if _http_client is None or _http_client.is_closed:
+        pool_size = max(HTTP_POOL_SIZE, llm_settings.max_concurrent_requests * 2)
+        limits = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=60
+        )
+        try:
+            transport = httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=0)
+        except ImportError:
+            transport = httpx.AsyncHTTPTransport(limits=limits, retries=0)
+        _http_client = httpx.AsyncClient(transport=transport, limits=limits, timeout=60.0)
+    
+    return _http_client
+
+
+async def _release_http_client():
+    """Release one user of the shared HTTP client, closing it after the last."""
+    global _http_client, _http_client_users
+    
+    _http_client_users = max(0, _http_client_users - 1)
+    if _http_client_users == 0 and _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 class LLMSummarizer:
     """
     LLM-based post summarizer using Fireworks AI.
     Extracts entities, sentiment, and key points from posts.
     """
     
-    def __init__(self, settings: AppSettings):
+    # Fallback summaries kept for repeated posts (LRU)
+    FALLBACK_CACHE_SIZE = 4096
+    
+    def __init__(
+        self,
+        settings: AppSettings,
+        cache: Optional[SummaryCache] = None
+    ):
         """
         Initialize LLM summarizer.
         
         Args:
             settings: Application settings
+            cache: Optional summary cache consulted before calling the API
         """
         self.settings = settings
         self.llm_settings = settings.llm
         self.logger = get_logger("llm_summarizer")
+        self.cache = cache
         
         # OpenAI async client (for Fireworks API)
         self.client: Optional[AsyncOpenAI] = None
         
+        # Route requests sharing the system prompt to the provider's prompt cache
+        self._extra_body = (
+            {"prompt_cache_key": self.llm_settings.prompt_cache_key}
+            if self.llm_settings.prompt_cache_key else None
+        )
+        
         # Rate limiter
         self._rate_limiter = RateLimiter(
             calls_per_second=self.llm_settings.requests_per_minute / 60.0
         )
         
+        # Fallback summaries by post content hash; crawls repeat posts often
+        self._fallback_cache: "OrderedDict[Tuple[str, Tuple[str, ...]], PostSummary]" = OrderedDict()
+        
         # Statistics tracking
         self._total_requests = 0
         self._successful_requests = 0
@@ -107,7 +253,8 @@ class LLMSummarizer:
             api_key=self.llm_settings.api_key,
             base_url=self.llm_settings.api_base_url,
             timeout=60.0,
-            max_retries=0  # Use tenacity for retries instead
+            max_retries=0,  # Use tenacity for retries instead
+            http_client=_get_http_client(self.llm_settings)
         )
         self.logger.info(
             f"OpenAI SDK initialized for Fireworks "
@@ -117,8 +264,10 @@ class LLMSummarizer:
     async def close(self):
         """Close the client."""
         if self.client:
-            await self.client.close()
+            # The connection pool is shared, so release it rather than
+            # closing it through the OpenAI client
             self.client = None
+            await _release_http_client()
     
     @retry(
         stop=stop_after_attempt(5),
@@ -144,7 +293,8 @@ class LLMSummarizer:
                 messages=messages,
                 max_tokens=self.llm_settings.max_tokens,
                 temperature=self.llm_settings.temperature,
-                response_format={"type": "json_object"} 
+                response_format={"type": "json_object"},
+                extra_body=self._extra_body
             )
             
             self._total_requests += 1
@@ -180,48 +330,118 @@ class LLMSummarizer:
             Parsed PostSummary
         """
         try:
-            data = json.loads(response)
-            sentiment_str = data.get("sentiment", "neutral").lower()
+            # Decode and validate in one pass
+            data = LLMResponse.model_validate_json(response)
+        except ValidationError:
+            return self._create_fallback_summary(post)
+        return self._summary_from_data(data, post)
+    
+    def _summary_from_data(self, data: LLMResponse, post: PostData) -> PostSummary:
+        """
+        Build PostSummary from a validated LLM result.
+        
+        Args:
+            data: Validated LLM result for a single post
+            post: Original post data
             
-            try:
-                sentiment = SentimentType(sentiment_str)
-            except ValueError:
-                sentiment = SentimentType.NEUTRAL
+        Returns:
+            Parsed PostSummary
+        """
+        return PostSummary(
+            post_id=post.id,
+            post_hash=post.content_hash,
+            tab=post.tab,
+            summary=data.summary,
+            key_points=data.key_points,
+            tickers=data.tickers + post.symbols,
+            companies=data.companies,
+            themes=data.themes,
+            sectors=data.sectors,
+            sentiment=data.sentiment,
+            sentiment_score=data.sentiment_score,
+            sentiment_reasoning=data.sentiment_reasoning,
+            model_used=self.llm_settings.model_name,
+            original_text_preview=truncate_text(post.text, 200)
+        )
+    
+    def _parse_batch_response(
+        self,
+        response: str,
+        posts: List[PostData]
+    ) -> List[PostSummary]:
+        """
+        Parse a batched LLM response into one PostSummary per post.
+        
+        Posts missing from the response fall back to keyword analysis.
+        
+        Args:
+            response: JSON response string
+            posts: Posts packed into the request
             
-            return PostSummary(
-                post_id=post.id,
-                post_hash=post.content_hash,
-                tab=post.tab,
-                summary=data.get("summary", ""),
-                key_points=data.get("key_points", []),
-                tickers=data.get("tickers", []) + post.symbols,
-                companies=data.get("companies", []),
-                themes=data.get("themes", []),
-                sectors=data.get("sectors", []),
-                sentiment=sentiment,
-                sentiment_score=float(data.get("sentiment_score", 0.0)),
-                sentiment_reasoning=data.get("sentiment_reasoning"),
-                model_used=self.llm_settings.model_name,
-                original_text_preview=truncate_text(post.text, 200)
-            )
-        except json.JSONDecodeError:
-            return self._create_fallback_summary(post)
+        Returns:
+            List of PostSummary objects in the order of posts
+        """
+        try:
+            data = orjson.loads(response)
+            items = data.get("summaries", []) if isinstance(data, dict) else data
+        except orjson.JSONDecodeError:
+            items = []
+        
+        # Valid JSON of the wrong shape covers no posts
+        if not isinstance(items, list):
+            items = []
+        
+        by_id = {
+            str(item.get("post_id")): item
+            for item in items
+            if isinstance(item, dict)
+        }
+        
+        summaries = []
+        for post in posts:
+            item = by_id.get(post.id)
+            try:
+                summary = (
+                    self._summary_from_data(LLMResponse.model_validate(item), post)
+                    if item else None
+                )
+            except ValidationError:
+                summary = None
+            summaries.append(summary or self._create_fallback_summary(post))
+        return summaries
     
-    def _create_fallback_summary(self, post: PostData) -> PostSummary:
+    def _create_fallback_summary(
+        self,
+        post: PostData,
+        sentiment_result: Optional[Tuple[str, float]] = None
+    ) -> PostSummary:
         """
         Create fallback summary using basic keyword analysis.
         
         Args:
             post: Post data
+            sentiment_result: Precomputed (label, score) from a batched
+                classification; computed from the post text if omitted
             
         Returns:
-            Basic PostSummary
+            Basic PostSummary (the same instance for a repeated post)
         """
-        sentiment_label, sentiment_score = classify_sentiment_basic(post.text)
+        # Symbols are part of the key since they are copied into the summary
+        key = (post.content_hash, tuple(post.symbols))
+        cached = self._fallback_cache.get(key)
+        if cached is not None:
+            self._fallback_cache.move_to_end(key)
+            if cached.post_id != post.id:
+                return cached.model_copy(update={"post_id": post.id})
+            return cached
+        
+        sentiment_label, sentiment_score = (
+            sentiment_result or classify_sentiment_basic(post.text)
+        )
         sentiment = SentimentType(sentiment_label)
         sectors = identify_sectors(post.text)
         
-        return PostSummary(
+        summary = PostSummary(
             post_id=post.id,
             post_hash=post.content_hash,
             tab=post.tab,
@@ -237,6 +457,11 @@ class LLMSummarizer:
             model_used="fallback",
             original_text_preview=truncate_text(post.text, 200)
         )
+        
+        self._fallback_cache[key] = summary
+        if len(self._fallback_cache) > self.FALLBACK_CACHE_SIZE:
+            self._fallback_cache.popitem(last=False)
+        return summary
     
     async def summarize_post(self, post: PostData) -> PostSummary:
         """
@@ -249,7 +474,7 @@ class LLMSummarizer:
             PostSummary
         """
         messages = [
-            {"role": "system", "content": SUMMARIZATION_PROMPT},
+            SYSTEM_MESSAGE,
             {"role": "user", "content": f"Post content:\n\n{post.text}"}
         ]
         
@@ -263,42 +488,184 @@ class LLMSummarizer:
             
         return self._create_fallback_summary(post)
     
+    def _split_cached(
+        self,
+        posts: List[PostData]
+    ) -> Tuple[List[PostSummary], List[PostData]]:
+        """
+        Separate posts with a cached summary from those needing the API.
+        
+        Args:
+            posts: Posts to look up
+            
+        Returns:
+            Tuple of (cached summaries, uncached posts)
+        """
+        if self.cache is None:
+            return [], list(posts)
+        
+        cached, uncached = [], []
+        for post in posts:
+            summary = self.cache.get(post)
+            if summary is not None:
+                cached.append(summary)
+            else:
+                uncached.append(post)
+        
+        if cached:
+            self.logger.info(f"Reused {len(cached)} cached summaries")
+        return cached, uncached
+    
+    def _cache_summary(self, post: PostData, summary: PostSummary):
+        """Store a real LLM summary in the cache (fallbacks are skipped)."""
+        if self.cache is not None and summary.model_used != "fallback":
+            self.cache.put(post, summary)
+    
     async def summarize_posts(
         self,
         posts: List[PostData],
-        batch_size: Optional[int] = None
+        batch_size: Optional[int] = None,
+        pack_size: Optional[int] = None
     ) -> List[PostSummary]:
         """
         Summarize multiple posts.
         
+        Up to pack_size posts are packed into each LLM request (see
+        summarize_batch); a pack_size of 1 sends one request per post.
+        
         Args:
             posts: List of posts to summarize
             batch_size: Number of concurrent requests
+            pack_size: Maximum posts per request
             
         Returns:
             List of PostSummary objects
         """
         if batch_size is None:
             batch_size = self.llm_settings.max_concurrent_requests
+        if pack_size is None:
+            pack_size = self.llm_settings.pack_size
             
-        summaries = []
+        summaries, posts = self._split_cached(posts)
+        chunks = self._chunk_posts(posts, pack_size)
         total = len(posts)
         
-        self.logger.info(f"Starting summarization of {total} posts (Batch size: {batch_size})")
+        self.logger.info(
+            f"Starting summarization of {total} posts in {len(chunks)} requests "
+            f"(Batch size: {batch_size})"
+        )
         
-        for i in range(0, total, batch_size):
-            batch = posts[i:i + batch_size]
-            tasks = [self.summarize_post(post) for post in batch]
-            
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Sliding window: a new request starts as soon as any one finishes
+        semaphore = asyncio.Semaphore(batch_size)
+        completed = 0
+        
+        async def summarize_chunk(chunk: List[PostData]) -> List[PostSummary]:
+            nonlocal completed
+            if len(chunk) == 1:
+                async with semaphore:
+                    results = [await self.summarize_post(chunk[0])]
+            else:
+                results = await self.summarize_batch(chunk, semaphore)
+            for post, summary in zip(chunk, results):
+                self._cache_summary(post, summary)
+            completed += len(chunk)
+            self.logger.info(f"Summarized {completed}/{total} posts...")
+            return results
+        
+        results = await asyncio.gather(
+            *(summarize_chunk(chunk) for chunk in chunks),
+            return_exceptions=True
+        )
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"Summarizing {len(chunk)} posts failed: {result}")
+                result = [self._create_fallback_summary(post) for post in chunk]
+            summaries.extend(result)
+        
+        # One cache transaction per batch rather than per summary
+        if self.cache is not None:
+            self.cache.commit()
             
-            for result in batch_results:
-                if isinstance(result, PostSummary):
-                    summaries.append(result)
+        return summaries
+    
+    def _chunk_posts(
+        self,
+        posts: List[PostData],
+        batch_size: int
+    ) -> List[List[PostData]]:
+        """
+        Split posts into request-sized chunks.
+        
+        Chunk size is capped so the expected response fits in max_tokens.
+        
+        Args:
+            posts: Posts to split
+            batch_size: Maximum posts per request
             
-            progress = min(i + batch_size, total)
-            self.logger.info(f"Summarized {progress}/{total} posts...")
+        Returns:
+            List of post chunks
+        """
+        budget = max(1, self.llm_settings.max_tokens // BATCH_TOKENS_PER_POST)
+        size = max(1, min(batch_size, budget))
+        return [posts[i:i + size] for i in range(0, len(posts), size)]
+    
+    async def summarize_batch(
+        self,
+        posts: List[PostData],
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> List[PostSummary]:
+        """
+        Summarize several posts with a single LLM request.
+        
+        Args:
+            posts: Posts to pack into one prompt
+            semaphore: Request slots shared with other batches; the packed
+                request and each retry hold one slot. Retries run one at a
+                time when omitted.
             
+        Returns:
+            List of PostSummary objects in the order of posts
+        """
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(1)
+        
+        content = "\n\n".join(f"[post_id: {post.id}]\n{post.text}" for post in posts)
+        messages = [
+            BATCH_SYSTEM_MESSAGE,
+            {"role": "user", "content": f"Posts:\n\n{content}"}
+        ]
+        
+        try:
+            async with semaphore:
+                response = await self._call_api(messages)
+        except Exception as e:
+            self.logger.debug(f"Batched LLM call failed: {e}")
+            self._failed_requests += 1
+            return [self._create_fallback_summary(post) for post in posts]
+        
+        if not response:
+            return [self._create_fallback_summary(post) for post in posts]
+        
+        summaries = self._parse_batch_response(response, posts)
+        missing = [
+            i for i, summary in enumerate(summaries)
+            if summary.model_used == "fallback"
+        ]
+        
+        # A reply that covered no post is garbled; retrying each post would
+        # spend a run of rate-limited calls on it
+        if len(missing) == len(posts):
+            return summaries
+        
+        # Posts the packed response skipped are retried concurrently, each
+        # within a request slot
+        async def retry(post: PostData) -> PostSummary:
+            async with semaphore:
+                return await self.summarize_post(post)
+        
+        retried = await asyncio.gather(*(retry(posts[i]) for i in missing))
+        for i, summary in zip(missing, retried):
+            summaries[i] = summary
         return summaries
     
     async def summarize_tab_posts(
@@ -361,12 +728,15 @@ class BatchSummarizer:
         Returns:
             Dictionary of summaries by tab
         """
-        summaries_by_tab = {}
         for tab, posts in posts_by_tab.items():
             self.logger.info(f"Processing tab '{tab}' with {len(posts)} posts")
-            summaries = await self.llm.summarize_tab_posts(tab, posts)
-            summaries_by_tab[tab] = summaries
-        return summaries_by_tab
+        
+        # Tabs share the summarizer's rate limiter, so run them all at once
+        results = await asyncio.gather(*(
+            self.llm.summarize_tab_posts(tab, posts)
+            for tab, posts in posts_by_tab.items()
+        ))
+        return dict(zip(posts_by_tab.keys(), results))
 
 
 class MockLLMSummarizer(LLMSummarizer):
@@ -378,4 +748,17 @@ class MockLLMSummarizer(LLMSummarizer):
     
     async def summarize_post(self, post: PostData) -> PostSummary:
         """Always use fallback summarization."""
-        return self._create_fallback_summary(post)
\ No newline at end of file
+        return self._create_fallback_summary(post)
+    
+    async def summarize_posts(
+        self,
+        posts: List[PostData],
+        batch_size: Optional[int] = None,
+        pack_size: Optional[int] = None
+    ) -> List[PostSummary]:
+        """Fallback-summarize all posts with one batched sentiment pass."""
+        sentiments = classify_sentiment_batch([post.text for post in posts])
+        return [
+            self._create_fallback_summary(post, sentiment)
+            for post, sentiment in zip(posts, sentiments)
+        ]
\ No newline at end of file
@@ -5,11 +5,15 @@ Defines the structure of posts, summaries, and reports.
 
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Any, Dict, List, Optional
 
 import xxhash
 from pydantic import BaseModel, ConfigDict, Field, computed_field
 
+# Bound once so hashing posts skips the module attribute lookup
+_hasher = xxhash.xxh3_64_intdigest
+
 
 class SentimentType(str, Enum):
     """Sentiment classification types."""
@@ -57,12 +61,40 @@ class PostData(BaseModel):
     # Additional raw data
     raw_data: Dict[str, Any] = Field(default_factory=dict, description="Additional raw fields")
     
-    @computed_field
-    @property
+    @cached_property
+    def content_digest(self) -> int:
+        """Content hash for deduplication as a 64-bit int (memoized; posts are frozen)."""
+        # Streamed into the hasher, so the text is not copied into a joined key
+        hasher = xxhash.xxh3_64(self.text.encode())
+        hasher.update(b"\x00")
+        hasher.update((self.author or "").encode())
+        hasher.update(b"\x00")
+        hasher.update(self.tab.encode())
+        return hasher.intdigest()
+    
+    @computed_field(repr=False)
+    @cached_property
     def content_hash(self) -> str:
-        """Generate content hash for deduplication."""
-        content = f"{self.text}:{self.author or ''}:{self.tab}"
-        return xxhash.xxh64(content.encode()).hexdigest()
+        """Content hash as 16 hex digits, as stored in files and summaries."""
+        return f"{self.content_digest:016x}"
+    
+    @cached_property
+    def text_digest(self) -> int:
+        """
+        Hash of the post text alone (memoized), shared by every consumer
+        that matches posts on text so the text is encoded and hashed once.
+        
+        Equals generate_content_digest(self.text).
+        """
+        return _hasher(self.text.encode())
+    
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "PostData":
+        """Copy the post, dropping memoized hashes if fields change."""
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            for key in ("content_digest", "content_hash", "text_digest"):
+                copied.__dict__.pop(key, None)
+        return copied
     
     def is_valid(self) -> bool:
         """Check if post data is valid and complete."""
@@ -74,7 +106,9 @@ class PostData(BaseModel):
         )
     
     model_config = ConfigDict(
-        ser_json_timedelta='iso8601'
+        ser_json_timedelta='iso8601',
+        extra='ignore',
+        frozen=True
     )
 
 
@@ -147,6 +181,9 @@ class StockMention(BaseModel):
         if total == 0:
             return 0.5
         return self.positive_mentions / total
+    
+    # Read-only once built
+    model_config = ConfigDict(frozen=True)
 
 
 class ThemeAnalysis(BaseModel):
@@ -166,6 +203,9 @@ class ThemeAnalysis(BaseModel):
     
     # Trend indicator
     trend_direction: Optional[str] = Field(default=None)  # "up", "down", "stable"
+    
+    # Read-only once built
+    model_config = ConfigDict(frozen=True)
 
 
 class TabStatistics(BaseModel):
@@ -192,6 +232,9 @@ class TabStatistics(BaseModel):
     # Crawl metadata
     crawl_duration_seconds: float = Field(default=0.0, ge=0)
     errors_count: int = Field(default=0, ge=0)
+    
+    # Read-only once built
+    model_config = ConfigDict(frozen=True)
 
 
 class CrawlReport(BaseModel):
@@ -3,9 +3,12 @@ Report Generator module for Xueqiu Crawler.
 Aggregates data and generates comprehensive markdown reports.
 """
 
+import heapq
 from collections import Counter, defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from itertools import chain
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from .config import AppSettings, SECTOR_KEYWORDS
 from .models import (
@@ -26,121 +29,207 @@ from .utils import (
 )
 
 
+# Sentiment tallies are packed into one int, 20 bits per lane (neutral,
+# positive, negative), so counting a mention is a single add. A lane holds
+# up to ~1M mentions, far above any crawl.
+_LANE_BITS = 20
+_LANE_MASK = (1 << _LANE_BITS) - 1
+_NEUTRAL_DELTA = 1
+
+# Summary sentiment -> packed tally delta; anything else counts as neutral
+_SENTIMENT_DELTAS = {
+    SentimentType.POSITIVE: 1 << _LANE_BITS,
+    SentimentType.NEGATIVE: 1 << (2 * _LANE_BITS),
+}
+
+# Theme trend -> sentiment bucket and markdown icon; anything else is neutral/flat
+_TREND_SENTIMENT = {"up": "positive", "down": "negative"}
+_TREND_ICONS = {"up": "🔺", "down": "🔻"}
+
+# Markdown table row templates
+_STOCK_ROW = "| {} | {} | {} | {} | {} | {} | {} |"
+_STATS_ROW = "| {} | {} | {:.1f} | {} |"
+
+
+class _StockAgg:
+    """Running tallies for one stock symbol."""
+    __slots__ = ("sentiment", "sample_post_ids", "companies")
+    
+    def __init__(self):
+        self.sentiment = 0
+        self.sample_post_ids: List[str] = []
+        self.companies: Counter = Counter()
+
+
+class _ThemeAgg:
+    """Running tallies for one theme or sector."""
+    __slots__ = ("sentiment", "stocks", "quotes", "quote_slots")
+    
+    def __init__(self):
+        self.sentiment = 0
+        self.stocks: Set[str] = set()
+        self.quotes: List[str] = []
+        self.quote_slots = 3  # quotes still to collect; the first three are kept
+
+
+def _unpack_sentiment(packed: int) -> Tuple[int, int, int]:
+    """Split a packed tally into (positive, neutral, negative) counts."""
+    return (packed >> _LANE_BITS) & _LANE_MASK, packed & _LANE_MASK, packed >> (2 * _LANE_BITS)
+
+
+def _sentiment_dict(packed: int) -> Dict[str, int]:
+    """Convert a packed tally to the reports' sentiment dict."""
+    positive, neutral, negative = _unpack_sentiment(packed)
+    return {"positive": positive, "neutral": neutral, "negative": negative}
+
+
+def _engagement_score(post: PostData) -> int:
+    """Rank posts for top discussions."""
+    return post.like_count + post.comment_count * 2 + post.retweet_count * 3
+
+
 class ReportGenerator:
     """
     Generates comprehensive markdown reports from crawl data.
     Aggregates statistics, sentiment analysis, and key insights.
+    
+    Invariant: inputs are already-validated PostData/PostSummary models
+    (validation happens where crawled and LLM data enter), so the report
+    models built here use model_construct and are never re-validated.
     """
     
     def __init__(self, settings: AppSettings):
         self.settings = settings
         self.logger = get_logger("report_generator")
     
-    def aggregate_stock_mentions(self, posts: List[PostData], summaries: List[PostSummary]) -> List[StockMention]:
-        summary_map = {s.post_id: s for s in summaries}
-        stock_data = defaultdict(lambda: {"count": 0, "positive": 0, "neutral": 0, "negative": 0, "post_ids": [], "companies": []})
-        
-        for post in posts:
-            symbols = set(post.symbols)
-            if post.id in summary_map:
-                summary = summary_map[post.id]
-                sentiment = summary.sentiment
-                if summary.companies:
-                    for sym in symbols:
-                        stock_data[sym]["companies"].extend(summary.companies)
-            else:
-                sentiment = SentimentType.NEUTRAL
-            
-            for symbol in symbols:
-                stock_data[symbol]["count"] += 1
-                stock_data[symbol]["post_ids"].append(post.id)
-                if sentiment == SentimentType.POSITIVE:
-                    stock_data[symbol]["positive"] += 1
-                elif sentiment == SentimentType.NEGATIVE:
-                    stock_data[symbol]["negative"] += 1
-                else:
-                    stock_data[symbol]["neutral"] += 1
-        
-        mentions = []
-        for symbol, data in stock_data.items():
-            company_name = None
-            if data["companies"]:
-                most_common = Counter(data["companies"]).most_common(1)
-                if most_common:
-                    company_name = most_common[0][0]
-            mentions.append(StockMention(symbol=symbol, name=company_name, mention_count=data["count"],
-                positive_mentions=data["positive"], neutral_mentions=data["neutral"],
-                negative_mentions=data["negative"], sample_post_ids=data["post_ids"][:5]))
-        
-        mentions.sort(key=lambda x: x.mention_count, reverse=True)
-        return mentions
-    
-    def aggregate_themes(self, summaries: List[PostSummary]) -> List[ThemeAnalysis]:
-        theme_data: Dict[str, Dict] = defaultdict(lambda: {"count": 0, "stocks": set(), "positive": 0, "neutral": 0, "negative": 0, "quotes": []})
+    def _aggregate_summaries(self, summaries: Iterable[PostSummary]) -> Tuple[Dict[str, PostSummary], Dict[str, int], List[ThemeAnalysis]]:
+        """Index summaries by post and tally sentiment and themes in one pass."""
+        summary_map = {}
+        distribution = 0
+        theme_data: Dict[str, _ThemeAgg] = defaultdict(_ThemeAgg)
+        get_delta = _SENTIMENT_DELTAS.get
         
         for summary in summaries:
+            summary_map[summary.post_id] = summary
+            delta = get_delta(summary.sentiment, _NEUTRAL_DELTA)
+            distribution += delta
             for theme in summary.themes + summary.sectors:
-                theme_data[theme]["count"] += 1
-                theme_data[theme]["stocks"].update(summary.tickers)
-                if summary.sentiment == SentimentType.POSITIVE:
-                    theme_data[theme]["positive"] += 1
-                elif summary.sentiment == SentimentType.NEGATIVE:
-                    theme_data[theme]["negative"] += 1
-                else:
-                    theme_data[theme]["neutral"] += 1
-                if len(theme_data[theme]["quotes"]) < 3:
-                    theme_data[theme]["quotes"].append(summary.original_text_preview)
+                agg = theme_data[theme]
+                agg.sentiment += delta
+                agg.stocks.update(summary.tickers)
+                if agg.quote_slots:
+                    agg.quotes.append(summary.original_text_preview)
+                    agg.quote_slots -= 1
         
         analyses = []
-        for theme, data in theme_data.items():
-            trend = "up" if data["positive"] > data["negative"] * 1.5 else "down" if data["negative"] > data["positive"] * 1.5 else "stable"
-            analyses.append(ThemeAnalysis(theme=theme, mention_count=data["count"], related_stocks=list(data["stocks"]),
-                sentiment_distribution={"positive": data["positive"], "neutral": data["neutral"], "negative": data["negative"]},
-                representative_quotes=data["quotes"], trend_direction=trend))
+        for theme, agg in theme_data.items():
+            positive, neutral, negative = _unpack_sentiment(agg.sentiment)
+            trend = "up" if positive > negative * 1.5 else "down" if negative > positive * 1.5 else "stable"
+            analyses.append(ThemeAnalysis.model_construct(theme=theme, mention_count=positive + neutral + negative, related_stocks=list(agg.stocks),
+                sentiment_distribution=_sentiment_dict(agg.sentiment), representative_quotes=agg.quotes, trend_direction=trend))
         analyses.sort(key=lambda x: x.mention_count, reverse=True)
-        return analyses
-    
-    def calculate_overall_sentiment(self, summaries: List[PostSummary]) -> Dict[str, int]:
-        distribution = {"positive": 0, "neutral": 0, "negative": 0}
-        for summary in summaries:
-            if summary.sentiment == SentimentType.POSITIVE:
-                distribution["positive"] += 1
-            elif summary.sentiment == SentimentType.NEGATIVE:
-                distribution["negative"] += 1
-            else:
-                distribution["neutral"] += 1
-        return distribution
+        return summary_map, _sentiment_dict(distribution), analyses
     
-    def get_top_discussions(self, posts: List[PostData], summaries: List[PostSummary], limit: int = 10) -> List[Dict[str, Any]]:
-        summary_map = {s.post_id: s for s in summaries}
-        scored_posts = [(p, p.like_count + p.comment_count * 2 + p.retweet_count * 3) for p in posts]
-        scored_posts.sort(key=lambda x: x[1], reverse=True)
+    def _aggregate_posts(self, posts: Iterable[PostData], summary_map: Dict[str, PostSummary], limit: int = 10) -> Tuple[int, List[StockMention], List[Dict[str, Any]]]:
+        """Dedupe posts by id, tally stock mentions and pick top discussions in one pass."""
+        stock_data: Dict[str, _StockAgg] = defaultdict(_StockAgg)
+        seen_ids = set()
+        hashes = set()
+        unique_posts = []
+        get_summary = summary_map.get
+        get_delta = _SENTIMENT_DELTAS.get
+        
+        for post in posts:
+            # Id repeats (pagination overlap, cross-tab reposts) are the same post
+            if post.id in seen_ids:
+                continue
+            seen_ids.add(post.id)
+            hashes.add(post.content_hash)
+            unique_posts.append(post)
+            
+            symbols = post.symbols
+            if not symbols:
+                continue
+            if len(symbols) > 1:
+                symbols = set(symbols)
+            summary = get_summary(post.id)
+            delta = get_delta(summary.sentiment, _NEUTRAL_DELTA) if summary else _NEUTRAL_DELTA
+            for symbol in symbols:
+                agg = stock_data[symbol]
+                agg.sentiment += delta
+                # Only the first few ids are reported as samples
+                if len(agg.sample_post_ids) < 5:
+                    agg.sample_post_ids.append(post.id)
+                if summary and summary.companies:
+                    agg.companies.update(summary.companies)
+        
+        mentions = []
+        for symbol, agg in stock_data.items():
+            # Most frequent name; ties go to the first seen, as with most_common(1)
+            companies = agg.companies
+            company_name = max(companies, key=companies.__getitem__) if companies else None
+            positive, neutral, negative = _unpack_sentiment(agg.sentiment)
+            mentions.append(StockMention.model_construct(symbol=symbol, name=company_name, mention_count=positive + neutral + negative,
+                positive_mentions=positive, neutral_mentions=neutral,
+                negative_mentions=negative, sample_post_ids=agg.sample_post_ids))
+        mentions.sort(key=lambda x: x.mention_count, reverse=True)
         
         top_discussions = []
-        for post, _ in scored_posts[:limit]:
-            summary = summary_map.get(post.id)
+        for post in heapq.nlargest(limit, unique_posts, key=_engagement_score):
+            summary = get_summary(post.id)
             discussion = {"id": post.id, "tab": post.tab, "text": post.text, "author": post.author, "symbols": post.symbols,
                 "engagement": {"likes": post.like_count, "comments": post.comment_count, "retweets": post.retweet_count}, "url": post.post_url}
             if summary:
                 discussion["sentiment"] = summary.sentiment.value
                 discussion["summary"] = summary.summary
             top_discussions.append(discussion)
-        return top_discussions
+        
+        return len(hashes), mentions, top_discussions
+    
+    def aggregate_stock_mentions(self, posts: List[PostData], summaries: List[PostSummary]) -> List[StockMention]:
+        summary_map = {s.post_id: s for s in summaries}
+        # No top discussions wanted here, so skip ranking the posts
+        return self._aggregate_posts(posts, summary_map, limit=0)[1]
+    
+    def aggregate_themes(self, summaries: List[PostSummary]) -> List[ThemeAnalysis]:
+        return self._aggregate_summaries(summaries)[2]
+    
+    def calculate_overall_sentiment(self, summaries: List[PostSummary]) -> Dict[str, int]:
+        # Counted in C without the full theme aggregation; anything not positive or negative is neutral
+        counts = Counter(map(attrgetter("sentiment"), summaries))
+        positive, negative = counts[SentimentType.POSITIVE], counts[SentimentType.NEGATIVE]
+        return {"positive": positive, "neutral": sum(counts.values()) - positive - negative, "negative": negative}
+    
+    def get_top_discussions(self, posts: List[PostData], summaries: List[PostSummary], limit: int = 10) -> List[Dict[str, Any]]:
+        summary_map = {s.post_id: s for s in summaries}
+        return self._aggregate_posts(posts, summary_map, limit)[2]
+    
+    def render_tab_section(self, tab: str, posts: List[PostData], summaries: List[PostSummary], stats: Optional[TabStatistics] = None) -> str:
+        sentiment = self.calculate_overall_sentiment(summaries)
+        symbol_counts = Counter(sym for post in posts for sym in set(post.symbols))
+        lines = [f"### {tab}", f"- **Posts:** {format_number(len(posts))} | **Summarized:** {format_number(len(summaries))}",
+            f"- **Sentiment:** Positive {sentiment['positive']}, Negative {sentiment['negative']}, Neutral {sentiment['neutral']}"]
+        if symbol_counts:
+            lines.append(f"- **Top Stocks:** {', '.join(f'{sym} ({n})' for sym, n in symbol_counts.most_common(5))}")
+        if stats:
+            lines.append(f"- **Crawl Duration:** {stats.crawl_duration_seconds:.1f}s | **Errors:** {stats.errors_count}")
+        lines.append("")
+        return "\n".join(lines)
     
     def generate_report(self, posts_by_tab: Dict[str, List[PostData]], summaries_by_tab: Dict[str, List[PostSummary]], tab_stats: Dict[str, TabStatistics]) -> CrawlReport:
-        all_posts = [p for posts in posts_by_tab.values() for p in posts]
-        all_summaries = [s for sums in summaries_by_tab.values() for s in sums]
+        # One streamed pass over the summaries, then one over the posts
+        summary_map, sentiment, themes = self._aggregate_summaries(chain.from_iterable(summaries_by_tab.values()))
+        unique_count, mentions, top_discussions = self._aggregate_posts(chain.from_iterable(posts_by_tab.values()), summary_map)
         
-        return CrawlReport(
+        return CrawlReport.model_construct(
             job_name=self.settings.job_name, job_start=datetime.utcnow(), job_end=datetime.utcnow(),
-            total_posts_collected=len(all_posts), total_unique_posts=len(set(p.content_hash for p in all_posts)),
-            total_posts_summarized=len(all_summaries), tab_statistics=tab_stats,
-            stock_mentions=self.aggregate_stock_mentions(all_posts, all_summaries),
-            theme_analysis=self.aggregate_themes(all_summaries),
-            overall_sentiment=self.calculate_overall_sentiment(all_summaries),
-            top_discussions=self.get_top_discussions(all_posts, all_summaries))
+            total_posts_collected=sum(map(len, posts_by_tab.values())), total_unique_posts=unique_count,
+            total_posts_summarized=sum(map(len, summaries_by_tab.values())), tab_statistics=tab_stats,
+            stock_mentions=mentions, theme_analysis=themes,
+            overall_sentiment=sentiment, top_discussions=top_discussions)
     
-    def generate_markdown(self, report: CrawlReport) -> str:
+    def generate_markdown(self, report: CrawlReport, tab_sections: Optional[List[str]] = None) -> str:
+        emojis = {s.value: get_sentiment_emoji(s.value) for s in SentimentType}
         lines = [f"# Xueqiu Discussion Report — {report.job_name}", "",
             f"**Generated:** {format_timestamp(report.job_end)}",
             f"**Total Posts Collected:** {format_number(report.total_posts_collected)}",
@@ -159,7 +248,7 @@ class ReportGenerator:
         
         lines.extend(["## Key Discussion Points", ""])
         for i, theme in enumerate(report.theme_analysis[:10], 1):
-            emoji = get_sentiment_emoji("positive" if theme.trend_direction == "up" else "negative" if theme.trend_direction == "down" else "neutral")
+            emoji = emojis[_TREND_SENTIMENT.get(theme.trend_direction, "neutral")]
             lines.append(f"{i}. **{theme.theme}** ({theme.mention_count} mentions) {emoji}")
             if theme.representative_quotes:
                 lines.append(f"   - *\"{truncate_text(theme.representative_quotes[0], 100)}\"*")
@@ -167,8 +256,9 @@ class ReportGenerator:
         
         lines.extend(["## Most Discussed Stocks", "", "| Rank | Symbol | Mentions | Sentiment | Bullish | Bearish | Neutral |",
             "|------|--------|----------|-----------|---------|---------|---------|"])
-        for i, stock in enumerate(report.stock_mentions[:20], 1):
-            lines.append(f"| {i} | {stock.symbol} | {stock.mention_count} | {get_sentiment_emoji(stock.overall_sentiment.value)} | {stock.positive_mentions} | {stock.negative_mentions} | {stock.neutral_mentions} |")
+        lines.extend(_STOCK_ROW.format(i, stock.symbol, stock.mention_count, emojis[stock.overall_sentiment.value],
+            stock.positive_mentions, stock.negative_mentions, stock.neutral_mentions)
+            for i, stock in enumerate(report.stock_mentions[:20], 1))
         lines.append("")
         
         lines.extend(["## Sentiment Distribution", "",
@@ -178,7 +268,7 @@ class ReportGenerator:
         
         lines.extend(["## Investment Themes & Sectors", ""])
         for theme in report.theme_analysis[:15]:
-            trend_icon = "🔺" if theme.trend_direction == "up" else "🔻" if theme.trend_direction == "down" else "▪️"
+            trend_icon = _TREND_ICONS.get(theme.trend_direction, "▪️")
             lines.extend([f"### {theme.theme} {trend_icon}", f"- **Mentions:** {theme.mention_count}"])
             if theme.related_stocks:
                 lines.append(f"- **Related Stocks:** {', '.join(theme.related_stocks[:5])}")
@@ -198,9 +288,12 @@ class ReportGenerator:
                 lines.append(f"[View Original]({discussion['url']})")
             lines.extend(["", "---", ""])
         
+        if tab_sections:
+            lines.extend(["## Tab Breakdown", ""] + tab_sections)
+        
         lines.extend(["## Data Collection Statistics", "", "| Tab | Posts | Duration (s) | Errors |", "|-----|-------|--------------|--------|"])
-        for tab_name, stats in report.tab_statistics.items():
-            lines.append(f"| {tab_name} | {stats.valid_posts} | {stats.crawl_duration_seconds:.1f} | {stats.errors_count} |")
+        lines.extend(_STATS_ROW.format(tab_name, stats.valid_posts, stats.crawl_duration_seconds, stats.errors_count)
+            for tab_name, stats in report.tab_statistics.items())
         lines.append("")
         
         lines.extend(["## Detailed Stock Analysis", ""])
@@ -218,9 +311,12 @@ class ReportGenerator:
         return "\n".join(lines)
     
     async def generate_and_save(self, posts_by_tab: Dict[str, List[PostData]], summaries_by_tab: Dict[str, List[PostSummary]],
-            tab_stats: Dict[str, TabStatistics], storage_manager) -> Tuple[CrawlReport, str]:
+            tab_stats: Dict[str, TabStatistics], storage_manager, tab_sections: Optional[List[str]] = None) -> Tuple[CrawlReport, str]:
         report = self.generate_report(posts_by_tab, summaries_by_tab, tab_stats)
-        markdown = self.generate_markdown(report)
+        if tab_sections is None:
+            tab_sections = [self.render_tab_section(tab, posts, summaries_by_tab.get(tab, []), tab_stats.get(tab))
+                for tab, posts in posts_by_tab.items()]
+        markdown = self.generate_markdown(report, tab_sections)
         await storage_manager.save_report(markdown)
         await storage_manager.save_report_json(report)
         self.logger.info("Report generated and saved successfully")
@@ -4,20 +4,117 @@ Handles file I/O, incremental updates, and data persistence.
 """
 
 import asyncio
-import json
+import mmap
 import os
+from collections import defaultdict, deque
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
 
-import aiofiles
 import orjson
+from pydantic import TypeAdapter
 
 from .config import AppSettings, StorageSettings
-from .models import CrawlReport, PostData, PostSummary, TabStatistics
+from .models import CrawlReport, PostData, PostSummary, SentimentType, TabStatistics
 from .utils import ensure_directory, get_logger, safe_filename
 
 
+# Models are serialized straight to JSON bytes by pydantic-core, without
+# building an intermediate dict per model
+_POST_ADAPTER = TypeAdapter(PostData)
+_SUMMARY_ADAPTER = TypeAdapter(PostSummary)
+
+
+# Write buffer for batched record writes; records are streamed through it
+# rather than joined into one blob the size of the whole batch
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _dump_post(post: PostData) -> bytes:
+    """Serialize a post as one JSONL record (without the newline)."""
+    return _POST_ADAPTER.dump_json(post)
+
+
+def _dump_summary(summary: PostSummary) -> bytes:
+    """Serialize a summary as one JSONL record (without the newline)."""
+    return _SUMMARY_ADAPTER.dump_json(summary)
+
+
+def _jsonl_chunks(records: Iterable[bytes]) -> List[bytes]:
+    """Interleave serialized records with newlines, without copying them."""
+    chunks = []
+    for record in records:
+        chunks.append(record)
+        chunks.append(b"\n")
+    return chunks
+
+
+def _write_file(filepath: Path, chunks: List[bytes], append: bool = False):
+    """Write (or append) byte chunks to a file in one blocking call."""
+    with open(filepath, 'ab' if append else 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+        f.writelines(chunks)
+
+
+def _replace_file(filepath: Path, chunks: List[bytes]):
+    """Atomically replace a file's contents via a temporary sibling."""
+    tmp_path = filepath.with_suffix(".tmp")
+    _write_file(tmp_path, chunks)
+    os.replace(tmp_path, filepath)
+
+
+def _parse_jsonl(filepath: Path) -> List[Dict[str, Any]]:
+    """
+    Parse a JSONL file line by line from a read-only memory map.
+    
+    Records are decoded straight out of the mapping, so the file is never
+    copied into one large bytes object before parsing.
+    """
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            records = []
+            view = memoryview(mm)
+            try:
+                start, end = 0, len(mm)
+                while start < end:
+                    stop = mm.find(b"\n", start)
+                    if stop < 0:
+                        stop = end
+                    if stop > start:
+                        records.append(orjson.loads(view[start:stop]))
+                    start = stop + 1
+            finally:
+                view.release()
+            return records
+
+
+def _construct_post(item: Dict[str, Any]) -> PostData:
+    """Rebuild a post this crawler serialized itself, skipping validation."""
+    item.pop("content_hash", None)
+    for key in ("timestamp", "created_at"):
+        if isinstance(item.get(key), str):
+            item[key] = datetime.fromisoformat(item[key])
+    return PostData.model_construct(**item)
+
+
+def _record_digest(record: Dict[str, Any]) -> int:
+    """Get a stored post's content digest, recomputing it if the hash is missing."""
+    key = record.get("content_hash")
+    if key:
+        return int(key, 16)
+    return _construct_post(record).content_digest
+
+
+def _construct_summary(item: Dict[str, Any]) -> PostSummary:
+    """Rebuild a summary this crawler serialized itself, skipping validation."""
+    if isinstance(item.get("processed_at"), str):
+        item["processed_at"] = datetime.fromisoformat(item["processed_at"])
+    if "sentiment" in item:
+        item["sentiment"] = SentimentType(item["sentiment"])
+    return PostSummary.model_construct(**item)
+
+
 class StorageManager:
     """
     Manages all data storage operations including:
@@ -25,6 +122,13 @@ class StorageManager:
     - Summary storage (per tab)
     - Report generation
     - Incremental updates
+    
+    Posts and summaries are stored as append-only JSON Lines per tab, so a
+    save writes only the new records. Each file has a small metadata
+    sidecar (`<name>.meta.json`) that is replaced atomically.
+    
+    Each file operation (open, read/write, close) runs as a single
+    asyncio.to_thread call rather than one thread hop per step.
     """
     
     def __init__(self, settings: AppSettings):
@@ -43,12 +147,16 @@ class StorageManager:
         self.summary_path = settings.get_summary_path()
         self.reports_path = settings.get_reports_path()
         
-        # In-memory caches for deduplication
-        self._seen_hashes: Set[str] = set()
+        # In-memory caches for deduplication. Hashes are kept as 64-bit ints
+        # rather than hex strings, about half the memory per entry.
+        self._seen_hashes: Set[int] = set()
         self._post_counts: Dict[str, int] = {}
+        self._summary_ids: Dict[str, Set[str]] = {}
         
-        # Lock for thread-safe operations
-        self._lock = asyncio.Lock()
+        # One lock per file, so saves for different tabs run in parallel.
+        # The shared dedup state is only mutated between awaits, so it needs
+        # no lock of its own.
+        self._file_locks: Dict[Path, asyncio.Lock] = defaultdict(asyncio.Lock)
         
         # Initialize directories
         self._init_directories()
@@ -62,19 +170,34 @@ class StorageManager:
         self.logger.info(f"Storage initialized at: {self.base_path}")
     
     def _get_raw_filepath(self, tab: str) -> Path:
-        """Get filepath for raw posts of a tab."""
+        """Get filepath for raw posts (JSONL) of a tab."""
         safe_tab = safe_filename(tab)
-        return self.raw_path / f"{self.settings.storage.raw_file_prefix}{safe_tab}.json"
+        return self.raw_path / f"{self.settings.storage.raw_file_prefix}{safe_tab}.jsonl"
     
     def _get_summary_filepath(self, tab: str) -> Path:
-        """Get filepath for summaries of a tab."""
+        """Get filepath for summaries (JSONL) of a tab."""
         safe_tab = safe_filename(tab)
-        return self.summary_path / f"{self.settings.storage.summary_file_prefix}{safe_tab}.json"
+        return self.summary_path / f"{self.settings.storage.summary_file_prefix}{safe_tab}.jsonl"
+    
+    @staticmethod
+    def _get_meta_filepath(filepath: Path) -> Path:
+        """Get the metadata sidecar path for a JSONL file."""
+        return filepath.with_suffix(".meta.json")
     
     def _get_report_filepath(self) -> Path:
         """Get filepath for final report."""
         return self.reports_path / self.settings.storage.report_filename
     
+    async def _read_records(self, filepath: Path) -> List[Dict[str, Any]]:
+        """Read all records from a JSONL file."""
+        return await asyncio.to_thread(_parse_jsonl, filepath)
+    
+    async def _write_meta(self, filepath: Path, metadata: Dict[str, Any]):
+        """Atomically replace the metadata sidecar of a JSONL file."""
+        await asyncio.to_thread(
+            _replace_file, self._get_meta_filepath(filepath), [orjson.dumps(metadata)]
+        )
+    
     async def load_existing_posts(self, tab: str) -> List[PostData]:
         """
         Load existing posts for a tab from disk.
@@ -91,27 +214,44 @@ class StorageManager:
             return []
         
         try:
-            async with aiofiles.open(filepath, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                data = orjson.loads(content)
-                
-                posts = []
-                for item in data.get("posts", []):
-                    try:
-                        post = PostData(**item)
-                        posts.append(post)
-                        self._seen_hashes.add(post.content_hash)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to parse post: {e}")
-                
-                self._post_counts[tab] = len(posts)
-                self.logger.info(f"Loaded {len(posts)} existing posts for tab '{tab}'")
-                return posts
+            posts = []
+            for item in await self._read_records(filepath):
+                try:
+                    post = _construct_post(item)
+                    posts.append(post)
+                    self._seen_hashes.add(post.content_digest)
+                except Exception as e:
+                    self.logger.warning(f"Failed to parse post: {e}")
+            
+            self._post_counts[tab] = len(posts)
+            self.logger.info(f"Loaded {len(posts)} existing posts for tab '{tab}'")
+            return posts
                 
         except Exception as e:
             self.logger.error(f"Error loading posts for tab '{tab}': {e}")
             return []
     
+    async def _index_existing_posts(self, tab: str, filepath: Path):
+        """
+        Record the hashes and count of posts already on disk for a tab.
+        
+        Only the stored content hash of each record is read; no PostData is
+        rebuilt, since the records are not needed in memory.
+        
+        Args:
+            tab: Tab name
+            filepath: Tab's posts file
+        """
+        try:
+            records = await self._read_records(filepath)
+        except Exception as e:
+            self.logger.error(f"Error loading posts for tab '{tab}': {e}")
+            records = []
+        
+        self._seen_hashes.update(map(_record_digest, records))
+        
+        self._post_counts[tab] = len(records)
+    
     async def save_posts(
         self, 
         tab: str, 
@@ -124,56 +264,46 @@ class StorageManager:
         Args:
             tab: Tab name
             posts: List of posts to save
-            incremental: If True, merge with existing posts
+            incremental: If True, append to existing posts; otherwise
+                replace them
             
         Returns:
             Number of new posts saved
         """
-        async with self._lock:
-            filepath = self._get_raw_filepath(tab)
+        filepath = self._get_raw_filepath(tab)
+        
+        async with self._file_locks[filepath]:
+            # The first append to a tab indexes what is already on disk, so
+            # dedup and counts cover earlier saves
+            if incremental and tab not in self._post_counts and filepath.exists():
+                await self._index_existing_posts(tab, filepath)
             
             # Filter duplicates
-            new_posts = []
-            for post in posts:
-                if post.content_hash not in self._seen_hashes:
-                    self._seen_hashes.add(post.content_hash)
-                    new_posts.append(post)
+            new_posts = self.filter_new_posts(posts)
             
             if not new_posts and not incremental:
                 return 0
             
-            # Load existing posts if incremental
-            existing_posts = []
-            if incremental and filepath.exists():
-                existing_posts = await self.load_existing_posts(tab)
-            
-            # Merge posts
-            all_posts = existing_posts + new_posts
+            total = (self._post_counts.get(tab, 0) if incremental else 0) + len(new_posts)
             
-            # Prepare data for saving
-            save_data = {
-                "metadata": {
+            # Append only the new records
+            try:
+                await asyncio.to_thread(
+                    _write_file, filepath, _jsonl_chunks(map(_dump_post, new_posts)), incremental
+                )
+                
+                await self._write_meta(filepath, {
                     "tab": tab,
                     "job_name": self.settings.job_name,
-                    "total_posts": len(all_posts),
+                    "total_posts": total,
                     "new_posts_this_save": len(new_posts),
                     "last_updated": datetime.utcnow().isoformat(),
-                },
-                "posts": [post.model_dump() for post in all_posts]
-            }
-            
-            # Save to file
-            try:
-                async with aiofiles.open(filepath, 'wb') as f:
-                    await f.write(orjson.dumps(
-                        save_data,
-                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
-                    ))
+                })
                 
-                self._post_counts[tab] = len(all_posts)
+                self._post_counts[tab] = total
                 self.logger.info(
                     f"Saved {len(new_posts)} new posts for tab '{tab}' "
-                    f"(total: {len(all_posts)})"
+                    f"(total: {total})"
                 )
                 return len(new_posts)
                 
@@ -181,6 +311,83 @@ class StorageManager:
                 self.logger.error(f"Error saving posts for tab '{tab}': {e}")
                 raise
     
+    def filter_new_posts(self, posts: List[PostData]) -> List[PostData]:
+        """
+        Filter out already-seen posts and mark the rest as seen.
+        
+        Args:
+            posts: Candidate posts
+            
+        Returns:
+            Posts whose content hash was not seen before
+        """
+        seen = self._seen_hashes
+        new_posts = []
+        for post in posts:
+            key = post.content_digest
+            if key not in seen:
+                seen.add(key)
+                new_posts.append(post)
+        return new_posts
+    
+    async def compact_posts(self, tab: str) -> int:
+        """
+        Compact a tab's posts file and refresh its metadata.
+        
+        Records appended by another process (or a previous run of the same
+        job) may repeat posts already on disk; the file is rewritten without
+        them only when repeats are found.
+        
+        Args:
+            tab: Tab name
+            
+        Returns:
+            Number of posts in the compacted file
+        """
+        filepath = self._get_raw_filepath(tab)
+        if not filepath.exists():
+            return 0
+        
+        async with self._file_locks[filepath]:
+            try:
+                content = await asyncio.to_thread(filepath.read_bytes)
+                lines = [line for line in content.splitlines() if line]
+                
+                # Keep the serialized lines as written; records are only
+                # parsed for their hash, never re-dumped
+                seen: Set[int] = set()
+                unique = []
+                for line in lines:
+                    key = _record_digest(orjson.loads(line))
+                    if key not in seen:
+                        seen.add(key)
+                        unique.append(line)
+                
+                if len(unique) < len(lines):
+                    await asyncio.to_thread(
+                        _replace_file, filepath, _jsonl_chunks(unique)
+                    )
+                
+                await self._write_meta(filepath, {
+                    "tab": tab,
+                    "job_name": self.settings.job_name,
+                    "total_posts": len(unique),
+                    "new_posts_this_save": len(unique) - self._post_counts.get(tab, 0),
+                    "last_updated": datetime.utcnow().isoformat(),
+                })
+                
+                self._seen_hashes.update(seen)
+                self._post_counts[tab] = len(unique)
+                self.logger.info(
+                    f"Compacted posts for tab '{tab}' "
+                    f"(total: {len(unique)}, dropped {len(lines) - len(unique)} repeats)"
+                )
+                return len(unique)
+                
+            except Exception as e:
+                self.logger.error(f"Error compacting posts for tab '{tab}': {e}")
+                raise
+    
     async def load_existing_summaries(self, tab: str) -> List[PostSummary]:
         """
         Load existing summaries for a tab from disk.
@@ -197,20 +404,17 @@ class StorageManager:
             return []
         
         try:
-            async with aiofiles.open(filepath, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                data = orjson.loads(content)
-                
-                summaries = []
-                for item in data.get("summaries", []):
-                    try:
-                        summary = PostSummary(**item)
-                        summaries.append(summary)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to parse summary: {e}")
-                
-                self.logger.info(f"Loaded {len(summaries)} existing summaries for tab '{tab}'")
-                return summaries
+            summaries = []
+            for item in await self._read_records(filepath):
+                try:
+                    summary = _construct_summary(item)
+                    summaries.append(summary)
+                except Exception as e:
+                    self.logger.warning(f"Failed to parse summary: {e}")
+            
+            self._summary_ids[tab] = {s.post_id for s in summaries}
+            self.logger.info(f"Loaded {len(summaries)} existing summaries for tab '{tab}'")
+            return summaries
                 
         except Exception as e:
             self.logger.error(f"Error loading summaries for tab '{tab}': {e}")
@@ -228,51 +432,49 @@ class StorageManager:
         Args:
             tab: Tab name
             summaries: List of summaries to save
-            incremental: If True, merge with existing summaries
+            incremental: If True, append to existing summaries; otherwise
+                replace them
             
         Returns:
             Number of new summaries saved
         """
-        async with self._lock:
-            filepath = self._get_summary_filepath(tab)
-            
-            # Track by post_id to avoid duplicates
-            existing_summaries = []
-            existing_ids = set()
-            
-            if incremental and filepath.exists():
-                existing_summaries = await self.load_existing_summaries(tab)
-                existing_ids = {s.post_id for s in existing_summaries}
+        filepath = self._get_summary_filepath(tab)
+        
+        async with self._file_locks[filepath]:
+            # Track by post_id to avoid duplicates, loading ids on first use
+            if not incremental:
+                self._summary_ids[tab] = set()
+            elif tab not in self._summary_ids:
+                self._summary_ids[tab] = set()
+                if filepath.exists():
+                    await self.load_existing_summaries(tab)
+            existing_ids = self._summary_ids[tab]
             
             # Filter new summaries
-            new_summaries = [s for s in summaries if s.post_id not in existing_ids]
-            
-            # Merge summaries
-            all_summaries = existing_summaries + new_summaries
+            new_summaries = []
+            for summary in summaries:
+                if summary.post_id not in existing_ids:
+                    existing_ids.add(summary.post_id)
+                    new_summaries.append(summary)
             
-            # Prepare data for saving
-            save_data = {
-                "metadata": {
+            # Append only the new records
+            try:
+                await asyncio.to_thread(
+                    _write_file, filepath, _jsonl_chunks(map(_dump_summary, new_summaries)),
+                    incremental
+                )
+                
+                await self._write_meta(filepath, {
                     "tab": tab,
                     "job_name": self.settings.job_name,
-                    "total_summaries": len(all_summaries),
+                    "total_summaries": len(existing_ids),
                     "new_summaries_this_save": len(new_summaries),
                     "last_updated": datetime.utcnow().isoformat(),
-                },
-                "summaries": [s.model_dump() for s in all_summaries]
-            }
-            
-            # Save to file
-            try:
-                async with aiofiles.open(filepath, 'wb') as f:
-                    await f.write(orjson.dumps(
-                        save_data,
-                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
-                    ))
+                })
                 
                 self.logger.info(
                     f"Saved {len(new_summaries)} new summaries for tab '{tab}' "
-                    f"(total: {len(all_summaries)})"
+                    f"(total: {len(existing_ids)})"
                 )
                 return len(new_summaries)
                 
@@ -293,8 +495,7 @@ class StorageManager:
         filepath = self._get_report_filepath()
         
         try:
-            async with aiofiles.open(filepath, 'w', encoding='utf-8') as f:
-                await f.write(report_content)
+            await asyncio.to_thread(filepath.write_text, report_content, encoding='utf-8')
             
             self.logger.info(f"Report saved to: {filepath}")
             return filepath
@@ -316,11 +517,11 @@ class StorageManager:
         filepath = self.reports_path / "report_data.json"
         
         try:
-            async with aiofiles.open(filepath, 'wb') as f:
-                await f.write(orjson.dumps(
-                    report.model_dump(),
-                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
-                ))
+            # Serialize straight to JSON in pydantic-core, with no
+            # intermediate dict tree (same bytes as orjson over model_dump)
+            await asyncio.to_thread(
+                filepath.write_text, report.model_dump_json(indent=2), encoding='utf-8'
+            )
             
             self.logger.info(f"Report data saved to: {filepath}")
             return filepath
@@ -336,14 +537,12 @@ class StorageManager:
         Returns:
             Dictionary mapping tab names to posts
         """
-        all_posts = {}
-        
-        for file in self.raw_path.glob(f"{self.settings.storage.raw_file_prefix}*.json"):
-            tab = file.stem.replace(self.settings.storage.raw_file_prefix, "")
-            posts = await self.load_existing_posts(tab)
-            all_posts[tab] = posts
+        prefix = self.settings.storage.raw_file_prefix
+        tabs = [file.stem.replace(prefix, "") for file in self.raw_path.glob(f"{prefix}*.jsonl")]
         
-        return all_posts
+        # Tabs load concurrently; each file is parsed in a worker thread
+        results = await asyncio.gather(*(self.load_existing_posts(tab) for tab in tabs))
+        return dict(zip(tabs, results))
     
     async def get_all_summaries(self) -> Dict[str, List[PostSummary]]:
         """
@@ -352,14 +551,11 @@ class StorageManager:
         Returns:
             Dictionary mapping tab names to summaries
         """
-        all_summaries = {}
-        
-        for file in self.summary_path.glob(f"{self.settings.storage.summary_file_prefix}*.json"):
-            tab = file.stem.replace(self.settings.storage.summary_file_prefix, "")
-            summaries = await self.load_existing_summaries(tab)
-            all_summaries[tab] = summaries
+        prefix = self.settings.storage.summary_file_prefix
+        tabs = [file.stem.replace(prefix, "") for file in self.summary_path.glob(f"{prefix}*.jsonl")]
         
-        return all_summaries
+        results = await asyncio.gather(*(self.load_existing_summaries(tab) for tab in tabs))
+        return dict(zip(tabs, results))
     
     def is_duplicate(self, content_hash: str) -> bool:
         """
@@ -371,7 +567,7 @@ class StorageManager:
         Returns:
             True if duplicate
         """
-        return content_hash in self._seen_hashes
+        return int(content_hash, 16) in self._seen_hashes
     
     def get_post_count(self, tab: Optional[str] = None) -> int:
         """
@@ -391,6 +587,7 @@ class StorageManager:
         """Cleanup resources."""
         self._seen_hashes.clear()
         self._post_counts.clear()
+        self._summary_ids.clear()
         self.logger.info("Storage manager cleaned up")
 
 
@@ -398,8 +595,17 @@ class IncrementalSaver:
     """
     Helper class for periodic incremental saves.
     Ensures data is saved at regular intervals during crawling.
+    
+    Each batch of new posts is appended to its tab's JSONL posts file as
+    soon as it arrives, in one write off the event loop, so memory stays
+    bounded on long crawls and already-written posts are never
+    re-serialized. The files are compacted and their metadata refreshed
+    once, on stop().
     """
     
+    # Pending summaries per tab that trigger a flush before the interval
+    FLUSH_THRESHOLD = 500
+    
     def __init__(
         self,
         storage: StorageManager,
@@ -416,9 +622,9 @@ class IncrementalSaver:
         self.interval = interval_seconds
         self.logger = get_logger("incremental_saver")
         
-        self._pending_posts: Dict[str, List[PostData]] = {}
-        self._pending_summaries: Dict[str, List[PostSummary]] = {}
-        self._lock = asyncio.Lock()
+        self._tabs: Set[str] = set()
+        self._pending_summaries: Dict[str, Deque[PostSummary]] = defaultdict(deque)
+        self._flush_requested = asyncio.Event()
         self._running = False
         self._task: Optional[asyncio.Task] = None
     
@@ -443,65 +649,106 @@ class IncrementalSaver:
                 pass
         
         # Final save of pending data
-        await self._flush()
+        await self.flush()
+        
+        tabs = list(self._tabs)
+        self._tabs.clear()
+        
+        # Tabs are separate files, so they compact in parallel
+        results = await asyncio.gather(
+            *(self.storage.compact_posts(tab) for tab in tabs),
+            return_exceptions=True
+        )
+        for tab, result in zip(tabs, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error merging posts for {tab}: {result}")
+        
         self.logger.info("Incremental saver stopped")
     
     async def add_posts(self, tab: str, posts: List[PostData]):
         """
-        Add posts to pending queue.
+        Append new posts to the tab's posts file.
+        
+        The first batch for a tab indexes whatever a previous run left in
+        the file, so a re-run of the same job does not append posts that
+        are already on disk.
         
         Args:
             tab: Tab name
             posts: Posts to add
         """
-        async with self._lock:
-            if tab not in self._pending_posts:
-                self._pending_posts[tab] = []
-            self._pending_posts[tab].extend(posts)
+        filepath = self.storage._get_raw_filepath(tab)
+        
+        async with self.storage._file_locks[filepath]:
+            if (
+                tab not in self._tabs
+                and tab not in self.storage._post_counts
+                and filepath.exists()
+            ):
+                await self.storage._index_existing_posts(tab, filepath)
+            self._tabs.add(tab)
+            
+            new_posts = self.storage.filter_new_posts(posts)
+            if not new_posts:
+                return
+            
+            await asyncio.to_thread(
+                _write_file, filepath, _jsonl_chunks(map(_dump_post, new_posts)), True
+            )
     
     async def add_summaries(self, tab: str, summaries: List[PostSummary]):
         """
         Add summaries to pending queue.
         
+        A tab that reaches FLUSH_THRESHOLD pending summaries wakes the save
+        loop early, so bursts are written promptly and the queue stays
+        bounded.
+        
         Args:
             tab: Tab name
             summaries: Summaries to add
         """
-        async with self._lock:
-            if tab not in self._pending_summaries:
-                self._pending_summaries[tab] = []
-            self._pending_summaries[tab].extend(summaries)
+        # flush() swaps queues out without awaiting, so no lock is needed
+        queue = self._pending_summaries[tab]
+        queue.extend(summaries)
+        if len(queue) >= self.FLUSH_THRESHOLD:
+            self._flush_requested.set()
     
     async def _save_loop(self):
         """Background loop for periodic saves."""
         while self._running:
             try:
-                await asyncio.sleep(self.interval)
-                await self._flush()
+                try:
+                    await asyncio.wait_for(self._flush_requested.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_requested.clear()
+                await self.flush()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 self.logger.error(f"Error in save loop: {e}")
     
-    async def _flush(self):
-        """Flush all pending data to disk."""
-        async with self._lock:
-            # Save pending posts
-            for tab, posts in self._pending_posts.items():
-                if posts:
-                    try:
-                        await self.storage.save_posts(tab, posts, incremental=True)
-                    except Exception as e:
-                        self.logger.error(f"Error saving posts for {tab}: {e}")
-            
-            # Save pending summaries
-            for tab, summaries in self._pending_summaries.items():
-                if summaries:
-                    try:
-                        await self.storage.save_summaries(tab, summaries, incremental=True)
-                    except Exception as e:
-                        self.logger.error(f"Error saving summaries for {tab}: {e}")
-            
-            # Clear pending data
-            self._pending_posts.clear()
-            self._pending_summaries.clear()
+    async def flush(self):
+        """
+        Flush all pending data to disk.
+        
+        Posts are written as they are added, so only summaries queued since
+        the last flush remain to be written.
+        """
+        # Take the pending summaries, so new ones can be queued while these
+        # are written
+        pending = {tab: list(q) for tab, q in self._pending_summaries.items() if q}
+        self._pending_summaries.clear()
+        
+        # Save pending summaries, all tabs in parallel
+        results = await asyncio.gather(
+            *(
+                self.storage.save_summaries(tab, summaries, incremental=True)
+                for tab, summaries in pending.items()
+            ),
+            return_exceptions=True
+        )
+        for tab, result in zip(pending, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error saving summaries for {tab}: {result}")
@@ -0,0 +1,245 @@
+"""
+Summary cache for Xueqiu Crawler.
+Reuses LLM summaries for repeated or near-identical posts across runs.
+"""
+
+import sqlite3
+from typing import Dict, List, Optional, Set
+
+import orjson
+
+from .config import AppSettings
+from .models import PostData, PostSummary
+from .utils import (
+    ensure_directory,
+    get_logger,
+    safe_filename,
+    truncate_text,
+)
+
+
+class SummaryCache:
+    """
+    Two-tier cache of LLM summaries keyed by post text.
+    
+    The first tier is an exact match on the hash of the post text, stored
+    in a SQLite database so lookups never require loading the whole cache.
+    The second tier is an optional semantic nearest-neighbour lookup,
+    enabled when sentence-transformers and hnswlib are installed.
+    """
+    
+    def __init__(self, settings: AppSettings):
+        """
+        Initialize summary cache.
+        
+        Args:
+            settings: Application settings
+        """
+        self.settings = settings
+        self.llm_settings = settings.llm
+        self.logger = get_logger("summary_cache")
+        
+        # One cache per model so summaries never cross models
+        model_key = safe_filename(self.llm_settings.model_name.replace("/", "_"))
+        self.cache_path = ensure_directory(settings.get_cache_path())
+        self._db_file = self.cache_path / f"summaries_{model_key}.sqlite3"
+        self._index_file = self.cache_path / f"summaries_{model_key}.hnsw"
+        
+        # Exact tier: text hash -> serialized summary, in SQLite. The key set
+        # is kept in memory so misses never touch the database.
+        self._db: Optional[sqlite3.Connection] = None
+        self._keys: Set[str] = set()
+        
+        # Semantic tier: index label -> text hash
+        self._labels: List[str] = []
+        self._encoder = None
+        self._index = None
+        
+        self._hits = 0
+        self._semantic_hits = 0
+        self._misses = 0
+        
+        self._init_semantic_tier()
+    
+    def _init_semantic_tier(self):
+        """Set up the embedding model and vector index if available."""
+        try:
+            import hnswlib
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            self.logger.debug(
+                "sentence-transformers/hnswlib not installed; "
+                "semantic cache disabled"
+            )
+            return
+        
+        try:
+            self._encoder = SentenceTransformer(self.llm_settings.cache_embedding_model)
+            dim = self._encoder.get_sentence_embedding_dimension()
+            self._index = hnswlib.Index(space="cosine", dim=dim)
+        except Exception as e:
+            self.logger.warning(f"Semantic cache unavailable: {e}")
+            self._encoder = None
+            self._index = None
+    
+    @staticmethod
+    def _text_key(post: PostData) -> str:
+        """Get exact-match key for post text (same as generate_content_hash(text))."""
+        return f"{post.text_digest:016x}"
+    
+    def _embed(self, text: str):
+        """Embed text as a normalized vector."""
+        return self._encoder.encode([text], normalize_embeddings=True)
+    
+    def load(self):
+        """Open the cache database and load the vector index from disk."""
+        try:
+            self._db = sqlite3.connect(self._db_file)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries "
+                "(key TEXT PRIMARY KEY, summary BLOB NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS labels "
+                "(label INTEGER PRIMARY KEY, key TEXT NOT NULL)"
+            )
+            self._keys = {row[0] for row in self._db.execute("SELECT key FROM summaries")}
+            self._labels = [
+                row[0] for row in self._db.execute("SELECT key FROM labels ORDER BY label")
+            ]
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to load summary cache: {e}")
+            self._db = None
+            self._keys = set()
+            self._labels = []
+        
+        if self._index is not None:
+            capacity = max(1024, len(self._labels) * 2)
+            if self._index_file.exists() and self._labels:
+                try:
+                    self._index.load_index(str(self._index_file), max_elements=capacity)
+                except Exception as e:
+                    self.logger.warning(f"Failed to load semantic index: {e}")
+                    self._index.init_index(max_elements=capacity)
+                    self._reset_labels()
+            else:
+                self._index.init_index(max_elements=capacity)
+                self._reset_labels()
+        
+        self.logger.info(f"Loaded {len(self._keys)} cached summaries")
+    
+    def _reset_labels(self):
+        """Forget the semantic index labels after the index was rebuilt."""
+        self._labels = []
+        if self._db is not None:
+            self._db.execute("DELETE FROM labels")
+    
+    def commit(self):
+        """Write summaries added since the last commit to the database."""
+        if self._db is None:
+            return
+        try:
+            self._db.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error committing summary cache: {e}")
+    
+    def save(self):
+        """Persist cached summaries and vector index to disk."""
+        self.commit()
+        try:
+            if self._index is not None and self._labels:
+                self._index.save_index(str(self._index_file))
+        except Exception as e:
+            self.logger.error(f"Error saving semantic index: {e}")
+    
+    def _load_entry(self, key: str) -> Optional[Dict]:
+        """Read a serialized summary from the database."""
+        if key not in self._keys or self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT summary FROM summaries WHERE key = ?", (key,)
+        ).fetchone()
+        return orjson.loads(row[0]) if row else None
+    
+    def _lookup_semantic(self, text: str) -> Optional[Dict]:
+        """Find a cached summary for text above the similarity threshold."""
+        if self._index is None or not self._labels:
+            return None
+        
+        labels, distances = self._index.knn_query(self._embed(text), k=1)
+        similarity = 1.0 - float(distances[0][0])
+        if similarity < self.llm_settings.cache_similarity_threshold:
+            return None
+        
+        return self._load_entry(self._labels[int(labels[0][0])])
+    
+    def get(self, post: PostData) -> Optional[PostSummary]:
+        """
+        Get cached summary for a post.
+        
+        Args:
+            post: Post to look up
+        
+        Returns:
+            Summary rebound to the post, or None on a miss
+        """
+        entry = self._load_entry(self._text_key(post))
+        if entry is not None:
+            self._hits += 1
+        else:
+            entry = self._lookup_semantic(post.text)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._semantic_hits += 1
+        
+        return PostSummary(**{
+            **entry,
+            "post_id": post.id,
+            "post_hash": post.content_hash,
+            "tab": post.tab,
+            "original_text_preview": truncate_text(post.text, 200),
+        })
+    
+    def put(self, post: PostData, summary: PostSummary):
+        """
+        Store summary for a post.
+        
+        Args:
+            post: Summarized post
+            summary: LLM summary for the post
+        """
+        key = self._text_key(post)
+        if key in self._keys or self._db is None:
+            return
+        
+        # Committed in bulk by commit()/save()
+        self._db.execute(
+            "INSERT OR IGNORE INTO summaries (key, summary) VALUES (?, ?)",
+            (key, orjson.dumps(summary.model_dump(mode="json")))
+        )
+        self._keys.add(key)
+        
+        if self._index is not None:
+            if len(self._labels) >= self._index.get_max_elements():
+                self._index.resize_index(len(self._labels) * 2)
+            self._index.add_items(self._embed(post.text), [len(self._labels)])
+            self._db.execute(
+                "INSERT INTO labels (label, key) VALUES (?, ?)",
+                (len(self._labels), key)
+            )
+            self._labels.append(key)
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Statistics dictionary
+        """
+        return {
+            "entries": len(self._keys),
+            "hits": self._hits,
+            "semantic_hits": self._semantic_hits,
+            "misses": self._misses,
+        }
@@ -3,23 +3,53 @@ Utility functions for Xueqiu Crawler.
 Includes logging, text processing, and helper functions.
 """
 
+import asyncio
 import logging
 import re
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Tuple, Union
 
+import numpy as np
 import xxhash
 from rich.console import Console
 from rich.logging import RichHandler
 
-from .config import SECTOR_KEYWORDS, SENTIMENT_KEYWORDS, STOCK_SYMBOL_PATTERNS
+from .config import (
+    SECTOR_KEYWORDS,
+    STOCK_SYMBOL_REGEXES,
+    count_sentiment,
+    extract_sectors,
+    regex_engine,
+)
 
 
 # Global console for rich output
 console = Console()
 
+# Precompiled text-processing patterns
+_HTML_TAG_REGEX = re.compile(r'<[^>]+>')
+_WHITESPACE_REGEX = re.compile(r'\s+')
+_CONTROL_CHAR_REGEX = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]')
+_CN_STOCK_REGEX = regex_engine.compile(r'\$([^\$]+)\(([A-Z]{2}\d+)\)\$')
+_URL_REGEX = regex_engine.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+_UNSAFE_FILENAME_REGEX = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+# The fixed-width shapes parse_timestamp accepts: a date, optionally followed
+# by " HH:MM:SS" or "THH:MM:SS[.ffffff]Z"
+_TIMESTAMP_REGEX = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})(?:([ T])(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?(Z?))?'
+)
+
+# Joins the parts of a content hash
+_HASH_SEPARATOR = b":"
+
+# Strings longer than this are encoded and hashed in slices of this many
+# characters, so huge posts are never copied whole into a bytes object
+_HASH_CHUNK_CHARS = 4 << 20
+
 
 def setup_logging(
     level: str = "INFO",
@@ -74,19 +104,52 @@ def get_logger(name: str = "xueqiu_crawler") -> logging.Logger:
     return logging.getLogger(name)
 
 
-def generate_content_hash(content: str, *args) -> str:
+def generate_content_hash(content: Union[str, bytes], *args) -> str:
     """
     Generate a unique hash for content deduplication.
     
     Args:
-        content: Primary content to hash
+        content: Primary content to hash, as text or UTF-8 bytes
         *args: Additional strings to include in hash
         
     Returns:
         Hexadecimal hash string
     """
-    combined = ":".join([content] + [str(a) for a in args if a])
-    return xxhash.xxh64(combined.encode('utf-8')).hexdigest()
+    is_text = isinstance(content, str)
+    if not args and not (is_text and len(content) > _HASH_CHUNK_CHARS):
+        return xxhash.xxh3_64_hexdigest(content.encode('utf-8') if is_text else content)
+    
+    # Feed the parts to the hasher in turn rather than copying the content
+    # into one joined buffer first
+    if not is_text:
+        hasher = xxhash.xxh3_64(content)
+    elif len(content) <= _HASH_CHUNK_CHARS:
+        hasher = xxhash.xxh3_64(content.encode('utf-8'))
+    else:
+        hasher = xxhash.xxh3_64()
+        for start in range(0, len(content), _HASH_CHUNK_CHARS):
+            hasher.update(content[start:start + _HASH_CHUNK_CHARS].encode('utf-8'))
+    
+    for arg in args:
+        if arg:
+            hasher.update(_HASH_SEPARATOR)
+            hasher.update(str(arg).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def generate_content_digest(content: str) -> int:
+    """
+    Generate a compact integer hash for in-memory deduplication.
+    
+    Matches generate_content_hash(content) when formatted as 16 hex digits.
+    
+    Args:
+        content: Content to hash
+        
+    Returns:
+        64-bit integer hash
+    """
+    return xxhash.xxh3_64_intdigest(content.encode('utf-8'))
 
 
 def clean_text(text: str) -> str:
@@ -103,13 +166,16 @@ def clean_text(text: str) -> str:
         return ""
     
     # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
+    if "<" in text:
+        text = _HTML_TAG_REGEX.sub('', text)
     
     # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_REGEX.sub(' ', text)
     
-    # Remove special characters but keep Chinese and basic punctuation
-    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', text)
+    # Remove special characters but keep Chinese and basic punctuation.
+    # Whitespace is plain spaces by now, so printable text has none to remove.
+    if not text.isprintable():
+        text = _CONTROL_CHAR_REGEX.sub('', text)
     
     return text.strip()
 
@@ -126,23 +192,18 @@ def extract_stock_symbols(text: str) -> List[str]:
     """
     symbols: Set[str] = set()
     
-    for pattern in STOCK_SYMBOL_PATTERNS:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            if isinstance(match, tuple):
-                # Handle complex patterns with groups
-                symbol = "".join(match).upper()
-            else:
-                symbol = match.upper()
+    for pattern in STOCK_SYMBOL_REGEXES:
+        for match in pattern.finditer(text):
+            # Complex patterns have several groups; join them
+            symbol = "".join(filter(None, match.groups())).upper()
             
             if symbol and len(symbol) >= 2:
                 symbols.add(symbol)
     
     # Also look for common Chinese stock formats: $股票名称(SH600519)$ format
-    cn_pattern = r'\$([^\$]+)\(([A-Z]{2}\d+)\)\$'
-    cn_matches = re.findall(cn_pattern, text)
-    for name, code in cn_matches:
-        symbols.add(code.upper())
+    if "$" in text:
+        for name, code in _CN_STOCK_REGEX.findall(text):
+            symbols.add(code.upper())
     
     return list(symbols)
 
@@ -157,11 +218,26 @@ def extract_urls(text: str) -> List[str]:
     Returns:
         List of URLs found
     """
-    url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-    urls = re.findall(url_pattern, text)
+    urls = _URL_REGEX.findall(text)
     return list(set(urls))
 
 
+def scan_post_text(text: str) -> Tuple[List[str], List[str]]:
+    """
+    Extract stock symbols and URLs from a post in one call.
+    
+    The URL scan is skipped outright for text without "://".
+    
+    Args:
+        text: Post text
+        
+    Returns:
+        Tuple of (stock symbols, URLs)
+    """
+    urls = extract_urls(text) if "://" in text else []
+    return extract_stock_symbols(text), urls
+
+
 def classify_sentiment_basic(text: str) -> tuple[str, float]:
     """
     Basic sentiment classification using keyword matching.
@@ -172,20 +248,7 @@ def classify_sentiment_basic(text: str) -> tuple[str, float]:
     Returns:
         Tuple of (sentiment_label, confidence_score)
     """
-    text_lower = text.lower()
-    
-    positive_count = sum(
-        1 for keyword in SENTIMENT_KEYWORDS["positive"]
-        if keyword in text_lower
-    )
-    negative_count = sum(
-        1 for keyword in SENTIMENT_KEYWORDS["negative"]
-        if keyword in text_lower
-    )
-    neutral_count = sum(
-        1 for keyword in SENTIMENT_KEYWORDS["neutral"]
-        if keyword in text_lower
-    )
+    positive_count, negative_count, neutral_count = count_sentiment(text)
     
     total = positive_count + negative_count + neutral_count
     
@@ -202,6 +265,42 @@ def classify_sentiment_basic(text: str) -> tuple[str, float]:
         return "neutral", 0.5
 
 
+def classify_sentiment_batch(texts: List[str]) -> List[Tuple[str, float]]:
+    """
+    Basic sentiment classification for many texts at once.
+    
+    Keyword counts are gathered per text, then labels and confidences are
+    computed for the whole batch with array operations. Results match
+    classify_sentiment_basic for each text.
+    
+    Args:
+        texts: Texts to classify
+        
+    Returns:
+        List of (sentiment_label, confidence_score) tuples
+    """
+    if not texts:
+        return []
+    
+    counts = np.array(
+        [count_sentiment(text) for text in texts],
+        dtype=np.float64
+    )
+    positive, negative, _ = counts.T
+    total = counts.sum(axis=1)
+    
+    is_positive = positive > negative * 1.5
+    is_negative = negative > positive * 1.5
+    
+    safe_total = np.where(total == 0, 1.0, total)
+    confidence = np.minimum(0.9, 0.5 + np.abs(positive - negative) / (safe_total * 2))
+    confidence = np.where(is_positive | is_negative, confidence, 0.5)
+    
+    labels = np.where(is_positive, "positive", np.where(is_negative, "negative", "neutral"))
+    
+    return [(str(label), float(score)) for label, score in zip(labels, confidence)]
+
+
 def identify_sectors(text: str) -> List[str]:
     """
     Identify market sectors mentioned in text.
@@ -212,16 +311,10 @@ def identify_sectors(text: str) -> List[str]:
     Returns:
         List of sector names found
     """
-    sectors = []
-    
-    for sector, keywords in SECTOR_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in text:
-                if sector not in sectors:
-                    sectors.append(sector)
-                break
+    found = extract_sectors(text)
     
-    return sectors
+    # Keep the SECTOR_KEYWORDS ordering
+    return [sector for sector in SECTOR_KEYWORDS if sector in found]
 
 
 def truncate_text(text: str, max_length: int = 200, suffix: str = "...") -> str:
@@ -279,6 +372,20 @@ def parse_timestamp(timestamp: any) -> Optional[datetime]:
                 timestamp = timestamp / 1000
             return datetime.fromtimestamp(timestamp)
         elif isinstance(timestamp, str):
+            # Build the common shapes directly; strptime (and the ValueError
+            # per rejected format) is only reached for unusual spellings
+            match = _TIMESTAMP_REGEX.fullmatch(timestamp)
+            if match:
+                year, month, day, sep, hour, minute, second, fraction, zulu = match.groups()
+                if sep is None:
+                    return datetime(int(year), int(month), int(day))
+                if (sep == "T") == bool(zulu) and not (fraction and sep == " "):
+                    return datetime(
+                        int(year), int(month), int(day),
+                        int(hour), int(minute), int(second),
+                        int(fraction.ljust(6, "0")) if fraction else 0
+                    )
+            
             # Try various formats
             formats = [
                 "%Y-%m-%dT%H:%M:%S.%fZ",
@@ -323,7 +430,7 @@ def safe_filename(name: str, max_length: int = 100) -> str:
         Safe filename string
     """
     # Replace unsafe characters
-    safe = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', name)
+    safe = _UNSAFE_FILENAME_REGEX.sub('_', name)
     # Remove leading/trailing whitespace and dots
     safe = safe.strip(' .')
     # Truncate if necessary
@@ -349,7 +456,12 @@ def calculate_progress(current: int, total: int) -> float:
 
 
 class RateLimiter:
-    """Simple rate limiter for API calls."""
+    """
+    Deadline-based rate limiter for API calls.
+    
+    Each caller reserves the next free time slot and sleeps only until it,
+    so concurrent callers are spaced out instead of waking together.
+    """
     
     def __init__(self, calls_per_second: float = 1.0):
         """
@@ -359,17 +471,18 @@ class RateLimiter:
             calls_per_second: Maximum calls per second
         """
         self.min_interval = 1.0 / calls_per_second
-        self.last_call = 0.0
+        self._next_slot = 0.0
     
     async def wait(self):
         """Wait if necessary to respect rate limit."""
-        import asyncio
-        import time
+        # No await between reading and reserving the slot, so this is
+        # atomic with respect to other tasks on the event loop
+        now = time.monotonic()
+        deadline = max(self._next_slot, now)
+        self._next_slot = deadline + self.min_interval
         
-        elapsed = time.time() - self.last_call
-        if elapsed < self.min_interval:
-            await asyncio.sleep(self.min_interval - elapsed)
-        self.last_call = time.time()
+        if deadline > now:
+            await asyncio.sleep(deadline - now)
 
 
 def format_number(n: int) -> str:
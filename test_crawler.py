@@ -9,19 +9,63 @@ from datetime import datetime
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from src.config import AppSettings, TabName, load_settings
+from src.config import TAB_BY_VALUE, AppSettings, TabName, load_settings
 from src.models import PostData, PostSummary, SentimentType
 from src.utils import (
     clean_text,
     extract_stock_symbols,
     classify_sentiment_basic,
+    classify_sentiment_batch,
     identify_sectors,
+    generate_content_digest,
     generate_content_hash,
+    RateLimiter,
 )
 
+try:
+    import pytest_benchmark  # noqa: F401
+    HAS_BENCHMARK = True
+except ImportError:
+    HAS_BENCHMARK = False
+
+# (text, expected symbols) pairs for extract_stock_symbols, built once
+STOCK_SYMBOL_CORPUS = [
+    ("今天买了SH600519，涨停了！", {"600519"}),               # Shanghai
+    ("SZ000001平安银行不错", {"000001"}),                     # Shenzhen
+    ("$AAPL$ is going up!", {"AAPL"}),                         # US
+    ("HK00700腾讯控股", {"00700"}),                            # Hong Kong
+    ("600519.SH 贵州茅台", {"600519SH"}),                      # Suffix form
+    ("000001.SZ平安银行", {"000001SZ"}),
+    ("600519.sh lowercase suffix", {"600519SH"}),
+    ("sh600036招商银行", {"600036"}),
+    ("$aapl$ lowercase", {"AAPL"}),
+    ("$SPY$ ETF", {"SPY"}),
+    ("$GOOGL$", {"GOOGL"}),
+    ("$TSLA$和$NVDA$都在涨", {"TSLA", "NVDA"}),
+    ("$AAPL$$MSFT$", {"AAPL", "MSFT"}),
+    ("SZ300750宁德时代和SZ002594比亚迪", {"300750", "002594"}),
+    ("HK09988阿里巴巴 and HK00700", {"09988", "00700"}),
+    ("代码600519.SH和SZ000858", {"600519SH", "000858"}),
+    ("SH600519 SH600519 repeated", {"600519"}),
+    ("SH6005190 seven digits", {"600519"}),
+    ("https://xueqiu.com/S/SH600519", {"600519"}),
+    ("SH600519.SH", {"600519", "600519SH"}),                   # Overlapping forms
+    ("007006.SZ600519", {"007006SZ", "600519"}),
+    ("HK007000.HK", {"00700", "007000HK"}),
+    ("$AB$CD$", {"AB"}),
+    ("$贵州茅台(SH600519)$", {"SH600519", "600519"}),          # Named format
+    ("$腾讯控股(HK00700)$", {"HK00700", "00700"}),
+    ("$BABA(US9988)$", {"BABAUS9988", "US9988"}),
+    ("$贵州茅台(sh600519)$", {"600519"}),
+    ("$A$ too short", set()),
+    ("$TOOLONG$", set()),
+    ("价格$100$元", set()),
+    ("SH60051 five digits", set()),
+    ("HK0070 four digits", set()),
+    ("没有股票代码的帖子", set()),
+    ("", set()),
+]
+
 
 class TestConfig:
     """Test configuration module."""
@@ -33,11 +77,23 @@ class TestConfig:
         assert settings.job_name is not None
         assert len(settings.available_tabs) == 8
     
+    def test_load_settings_returns_independent_copies(self, tmp_path):
+        """Test cached settings are not shared between callers."""
+        settings1 = load_settings()
+        settings2 = load_settings()
+        settings1.storage.base_dir = tmp_path
+        assert settings2.storage.base_dir != settings1.storage.base_dir
+        assert settings1.job_name == settings2.job_name
+    
     def test_tab_names(self):
         """Test all tab names are defined."""
         expected_tabs = ["热门", "7x24", "视频", "基金", "资讯", "达人", "私募", "ETF"]
         actual_tabs = [t.value for t in TabName]
         assert actual_tabs == expected_tabs
+        
+        for value in expected_tabs:
+            assert TAB_BY_VALUE[value] is TabName(value)
+        assert TAB_BY_VALUE["热门"] is TabName.REMEN
     
     def test_storage_paths(self):
         """Test storage path generation."""
@@ -51,62 +107,115 @@ class TestConfig:
 class TestUtils:
     """Test utility functions."""
     
-    def test_clean_text(self):
+    @pytest.mark.parametrize("text,expected", [
+        ("<p>Hello</p>", "Hello"),                               # HTML removal
+        ("Hello   World", "Hello World"),                        # Whitespace
+        ("Hello\r\nWorld", "Hello World"),
+        ("  \t\n ", ""),
+        ("", ""),                                                # Empty
+        (None, ""),
+        ("<div><p>茅台</p>\n<p>涨停</p></div>", "茅台 涨停"),   # Nested tags
+        ('<a href="x">$SH600519$</a> 看好', "$SH600519$ 看好"),  # Attributes
+        ('<img src="x.png">', ""),
+        ("<br/>\u3000全角\u3000空格 ", "全角 空格"),            # Full-width space
+        ("a\x00b\x07c", "abc"),                                  # Control chars
+    ])
+    def test_clean_text(self, text, expected):
         """Test text cleaning."""
-        # HTML removal
-        assert clean_text("<p>Hello</p>") == "Hello"
+        assert clean_text(text) == expected
+    
+    def test_clean_text_html_corpus(self):
+        """Test cleaning 1k mixed-HTML posts, including a 10 KB blob."""
+        posts = [
+            f'<div class="detail"><p>帖子 {i}</p>\n<p>  <b>SH600519</b> 看好 </p></div>'
+            if i % 2 else f"帖子 {i}  SH600519\t看好"
+            for i in range(999)
+        ]
+        posts.append("<p>茅台 涨停</p>" * 600)
+        assert len(posts[-1].encode()) > 10_000
         
-        # Whitespace normalization
-        assert clean_text("Hello   World") == "Hello World"
+        cleaned = [clean_text(post) for post in posts]
         
-        # Empty string
-        assert clean_text("") == ""
-        assert clean_text(None) == ""
+        assert cleaned[:4] == [f"帖子 {i} SH600519 看好" for i in range(4)]
+        assert cleaned[-1] == "茅台 涨停" * 600
+        assert all("<" not in text and "  " not in text for text in cleaned)
     
-    def test_extract_stock_symbols(self):
+    @pytest.mark.parametrize("text,expected", STOCK_SYMBOL_CORPUS)
+    def test_extract_stock_symbols(self, text, expected):
         """Test stock symbol extraction."""
-        # Shanghai stocks
-        text = "今天买了SH600519，涨停了！"
-        symbols = extract_stock_symbols(text)
-        assert "SH600519" in symbols or "600519" in symbols
-        
-        # Shenzhen stocks
-        text = "SZ000001平安银行不错"
-        symbols = extract_stock_symbols(text)
-        assert any("000001" in s for s in symbols)
-        
-        # US stocks
-        text = "$AAPL$ is going up!"
         symbols = extract_stock_symbols(text)
-        assert "AAPL" in symbols
+        assert set(symbols) == expected
+        assert len(symbols) == len(expected)  # No duplicates
     
-    def test_classify_sentiment_basic(self):
+    @pytest.mark.parametrize("text,expected", [
+        ("这只股票涨势很好，利好消息", "positive"),
+        ("强烈推荐买入，看好后市", "positive"),
+        ("突破新高，翻倍可期", "positive"),
+        ("龙头股潜力巨大", "positive"),
+        ("飙升！暴涨！", "positive"),
+        ("看好，买入，小心风险", "positive"),      # 2 vs 1 clears the 1.5x margin
+        ("暴跌了，利空消息太多", "negative"),
+        ("风险太大，建议卖出", "negative"),
+        ("警惕爆仓，赶紧减持", "negative"),
+        ("公司暴雷，股价腰斩", "negative"),
+        ("破位下行，弱势明显", "negative"),
+        ("崩盘了，抛售潮", "negative"),
+        ("今天市场波动不大", "neutral"),
+        ("继续观望，等待方向", "neutral"),
+        ("横盘震荡，维持持有", "neutral"),
+        ("有涨有跌", "neutral"),
+        ("利好与利空交织", "neutral"),
+        ("大涨之后要警惕风险", "neutral"),
+        ("上涨乏力，下跌风险大", "neutral"),      # 2 vs 3 is within the margin
+        ("向上还是向下？", "neutral"),
+        ("", "neutral"),
+    ])
+    def test_classify_sentiment_basic(self, text, expected):
         """Test basic sentiment classification."""
-        # Positive
-        sentiment, score = classify_sentiment_basic("这只股票涨势很好，利好消息")
-        assert sentiment == "positive"
-        
-        # Negative
-        sentiment, score = classify_sentiment_basic("暴跌了，利空消息太多")
-        assert sentiment == "negative"
-        
-        # Neutral
-        sentiment, score = classify_sentiment_basic("今天市场波动不大")
-        assert sentiment in ["neutral", "positive", "negative"]
+        sentiment, score = classify_sentiment_basic(text)
+        assert sentiment == expected
+        assert 0.5 <= score <= 0.9
+    
+    def test_classify_sentiment_batch(self):
+        """Test batched classification matches per-text classification."""
+        texts = ["这只股票涨势很好，利好消息", "暴跌了，利空消息太多", "今天市场波动不大", ""]
+        expected = [classify_sentiment_basic(t) for t in texts]
+        assert classify_sentiment_batch(texts) == expected
+        assert classify_sentiment_batch([]) == []
     
-    def test_identify_sectors(self):
+    @pytest.mark.parametrize("text,expected", [
+        ("芯片和AI人工智能板块今天大涨", {"Technology"}),
+        ("半导体设备订单饱满", {"Technology"}),
+        ("算力需求推动云计算增长", {"Technology"}),
+        ("光伏和储能装机超预期", {"New Energy"}),
+        ("锂电池价格下跌", {"New Energy"}),
+        ("充电桩建设提速", {"New Energy"}),
+        ("创新药出海加速", {"Healthcare"}),
+        ("疫苗和中药板块分化", {"Healthcare"}),
+        ("CXO订单回暖", {"Healthcare"}),
+        ("白酒消费板块继续强势", {"Consumer"}),
+        ("家电零售数据亮眼", {"Consumer"}),
+        ("旅游餐饮复苏", {"Consumer"}),
+        ("券商和保险领涨", {"Finance"}),
+        ("基金仓位下降", {"Finance"}),
+        ("房地产政策放松，楼市回暖", {"Real Estate"}),
+        ("物业公司现金流改善", {"Real Estate"}),
+        ("钢铁和有色表现强势", {"Manufacturing"}),
+        ("汽车销量创新高", {"Manufacturing"}),
+        ("机械制造景气回升", {"Manufacturing"}),
+        ("银行股和新能源车都在涨", {"Finance", "New Energy"}),
+        ("汽车电池需求旺盛", {"New Energy", "Manufacturing"}),
+        ("证券软件故障", {"Technology", "Finance"}),
+        ("今天市场波动不大", set()),
+        ("", set()),
+    ])
+    def test_identify_sectors(self, text, expected):
         """Test sector identification."""
-        # Tech sector
-        sectors = identify_sectors("芯片和AI人工智能板块今天大涨")
-        assert "科技" in sectors
-        
-        # Consumer sector
-        sectors = identify_sectors("白酒消费板块继续强势")
-        assert "消费" in sectors
-        
-        # Multiple sectors
-        sectors = identify_sectors("银行股和新能源车都在涨")
-        assert len(sectors) >= 2
+        assert set(identify_sectors(text)) == expected
+    
+    def test_identify_sectors_keeps_keyword_order(self):
+        """Test sectors come back in SECTOR_KEYWORDS order, once each."""
+        assert identify_sectors("证券软件故障，芯片和银行") == ["Technology", "Finance"]
     
     def test_generate_content_hash(self):
         """Test content hash generation."""
@@ -116,12 +225,70 @@ class TestUtils:
         
         assert hash1 == hash2  # Same content = same hash
         assert hash1 != hash3  # Different content = different hash
-        assert len(hash1) == 16  # xxhash64 produces 16 char hex
+        assert len(hash1) == 16  # 64-bit xxh3 produces 16 char hex
+    
+    def test_generate_content_hash_bytes_and_slices(self, monkeypatch):
+        """Test bytes input and sliced hashing of long text match plain hashing."""
+        import src.utils as utils
+        
+        text = "雪球 Hello World"
+        expected = generate_content_hash(text, "user1")
+        assert generate_content_hash(text.encode("utf-8")) == generate_content_hash(text)
+        
+        monkeypatch.setattr(utils, "_HASH_CHUNK_CHARS", 4)
+        assert generate_content_hash(text, "user1") == expected
+        assert generate_content_hash(text) == generate_content_hash(text.encode("utf-8"))
+    
+    @pytest.mark.skipif(not HAS_BENCHMARK, reason="pytest-benchmark not installed")
+    def test_hash_batch_throughput(self, benchmark):
+        """Test hashing 10k short posts stays under 1µs per post."""
+        texts = [f"帖子 {i} " * 20 for i in range(10000)]
+        benchmark(lambda: [generate_content_hash(text) for text in texts])
+        assert benchmark.stats["mean"] / len(texts) < 1e-6
+    
+    @pytest.mark.skipif(not HAS_BENCHMARK, reason="pytest-benchmark not installed")
+    def test_hash_throughput(self, benchmark):
+        """Test hashing 1 MiB stays fast (guards against slower hash functions)."""
+        data = b"x" * (1 << 20)
+        benchmark(generate_content_hash, data)
+        assert benchmark.stats["mean"] < 0.005
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_rate_limiter_spaces_concurrent_calls(self, monkeypatch):
+        """Test concurrent callers reserve distinct, evenly spaced deadlines."""
+        from types import SimpleNamespace
+        
+        from src import utils
+        
+        # Freeze the clock and record sleeps, so wakeup jitter cannot
+        # affect the deadlines under test
+        delays = []
+        
+        async def sleep(delay):
+            delays.append(delay)
+        
+        monkeypatch.setattr(utils, "time", SimpleNamespace(monotonic=lambda: 100.0))
+        monkeypatch.setattr(utils, "asyncio", SimpleNamespace(sleep=sleep))
+        
+        limiter = RateLimiter(calls_per_second=50)
+        await asyncio.gather(*(limiter.wait() for _ in range(4)))
+        
+        # The first caller goes at once; the rest sleep to consecutive slots
+        assert delays == pytest.approx([0.02, 0.04, 0.06])
+        assert limiter._next_slot == pytest.approx(100.08)
+    
+    def test_generate_content_digest(self):
+        """Test integer digest matches the hex content hash."""
+        digest = generate_content_digest("雪球 Hello")
+        assert f"{digest:016x}" == generate_content_hash("雪球 Hello")
 
 
 class TestModels:
     """Test data models."""
     
+    # Validated once; variants are derived with model_copy
+    BASE_POST = PostData(id="1", text="Content", tab="热门", author="user1")
+    
     def test_post_data_creation(self):
         """Test PostData model."""
         post = PostData(
@@ -139,25 +306,36 @@ class TestModels:
     def test_post_data_validation(self):
         """Test PostData validation."""
         # Valid post
-        post = PostData(id="1", text="Content", tab="热门")
-        assert post.is_valid() == True
+        assert self.BASE_POST.is_valid() == True
         
         # Invalid - empty text
-        post = PostData(id="1", text="", tab="热门")
+        post = self.BASE_POST.model_copy(update={"text": ""})
         assert post.is_valid() == False
         
         # Invalid - empty id
-        post = PostData(id="", text="Content", tab="热门")
+        post = self.BASE_POST.model_copy(update={"id": ""})
         assert post.is_valid() == False
     
-    def test_post_data_content_hash(self):
+    @pytest.mark.parametrize("text1,text2,same", [
+        ("Same content", "Same content", True),
+        ("Same content", "Different", False),
+    ])
+    def test_post_data_content_hash(self, text1, text2, same):
         """Test content hash computation."""
-        post1 = PostData(id="1", text="Same content", tab="热门", author="user1")
-        post2 = PostData(id="2", text="Same content", tab="热门", author="user1")
-        post3 = PostData(id="3", text="Different", tab="热门", author="user1")
+        post1 = self.BASE_POST.model_copy(update={"text": text1})
+        post2 = post1.model_copy(update={"id": "2", "text": text2})
         
-        assert post1.content_hash == post2.content_hash
-        assert post1.content_hash != post3.content_hash
+        assert (post1.content_hash == post2.content_hash) == same
+    
+    def test_post_data_content_hash_memoized(self):
+        """Test the content hash is computed once and reset on changed copies."""
+        post = PostData(id="1", text="Same content", tab="热门", author="user1")
+        
+        assert post.content_hash is post.content_hash
+        assert "content_hash" in post.__dict__
+        
+        copied = post.model_copy(update={"text": "Different"})
+        assert copied.content_hash != post.content_hash
     
     def test_post_summary_creation(self):
         """Test PostSummary model."""
@@ -190,7 +368,7 @@ class TestCrawler:
         """Create test settings."""
         return load_settings()
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_crawler_initialization(self, settings):
         """Test crawler can be initialized."""
         from src.crawler import XueqiuCrawler
@@ -198,20 +376,74 @@ class TestCrawler:
         crawler = XueqiuCrawler(settings)
         assert crawler is not None
         assert crawler.settings == settings
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_crawl_tabs_bounds_concurrency(self, settings):
+        """Test tab crawls never exceed the configured concurrency."""
+        from src.crawler import XueqiuCrawler
+        
+        settings.crawler.max_concurrent_tabs = 2
+        crawler = XueqiuCrawler(settings)
+        crawler._playwright_available = False
+        active, peak = 0, 0
+        
+        async def fake_crawl_tab(tab, max_posts=None, context=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return [PostData(id=tab.value, text="Content", tab=tab.value)]
+        
+        crawler.crawl_tab = fake_crawl_tab
+        results = await crawler.crawl_tabs(list(TabName))
+        
+        assert peak == 2
+        assert all(len(posts) == 1 for posts in results.values())
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_crawl_tabs_recycles_idle_context(self, settings):
+        """Test a pooled context is replaced once idle and past its post budget."""
+        from src.crawler import XueqiuCrawler
+        
+        settings.crawler.max_concurrent_tabs = 1
+        settings.crawler.context_recycle_posts = 2
+        crawler = XueqiuCrawler(settings)
+        crawler._playwright_available = True
+        
+        opened = []
+        
+        async def new_context(storage_state=None):
+            context = MagicMock()
+            context.storage_state = AsyncMock(return_value={"cookies": [len(opened)]})
+            context.close = AsyncMock()
+            opened.append((context, storage_state))
+            return context
+        
+        async def fake_crawl_tab(tab, max_posts=None, context=None):
+            return [PostData(id=tab.value, text="Content", tab=tab.value)]
+        
+        crawler._new_context = new_context
+        crawler.crawl_tab = fake_crawl_tab
+        await crawler.crawl_tabs(list(TabName)[:4])
+        
+        # Recycled after every second tab, carrying its storage state over
+        assert [state for _, state in opened] == [None, {"cookies": [0]}]
+        assert all(context.close.await_count == 1 for context, _ in opened)
 
 
 class TestStorage:
     """Test storage functionality."""
     
     @pytest.fixture
-    def settings(self):
-        """Create test settings with temp directory."""
+    def settings(self, tmp_path):
+        """Create test settings with a per-test temp directory."""
         settings = load_settings()
         settings.job_name = "test_job"
-        settings.storage.base_dir = Path("/tmp/xueqiu_test")
+        settings.storage.base_dir = tmp_path
         return settings
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_storage_initialization(self, settings):
         """Test storage manager initialization."""
         from src.storage import StorageManager
@@ -221,10 +453,159 @@ class TestStorage:
         assert storage.raw_path.exists()
         assert storage.summary_path.exists()
         assert storage.reports_path.exists()
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_incremental_saver_journal(self, settings):
+        """Test saver appends only new posts and compacts on stop."""
+        from src.storage import IncrementalSaver, StorageManager, _dump_post
+        
+        storage = StorageManager(settings)
+        saver = IncrementalSaver(storage)
+        
+        post = PostData(id="1", text="Content", tab="热门")
+        await saver.add_posts("热门", [post])
+        await saver.add_posts("热门", [post])
+        
+        # Written as added, whole lines only; nothing waits for a flush
+        filepath = storage._get_raw_filepath("热门")
+        assert filepath.read_bytes().splitlines(keepends=True) == [_dump_post(post) + b"\n"]
+        
+        await saver.stop()
+        assert storage._get_meta_filepath(filepath).exists()
+        assert storage.get_post_count("热门") == 1
+        posts = await storage.load_existing_posts("热门")
+        assert [p.id for p in posts] == ["1"]
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_incremental_saver_rerun_skips_saved_posts(self, settings):
+        """Test a re-run of the same job does not append posts already on disk."""
+        from src.storage import IncrementalSaver, StorageManager
+        
+        await StorageManager(settings).save_posts("热门", [PostData(id="1", text="A", tab="热门")])
+        
+        storage = StorageManager(settings)
+        saver = IncrementalSaver(storage)
+        await saver.add_posts("热门", [
+            PostData(id="1", text="A", tab="热门"),
+            PostData(id="2", text="B", tab="热门"),
+        ])
+        await saver.flush()
+        
+        # Already deduplicated before compaction runs
+        lines = storage._get_raw_filepath("热门").read_bytes().splitlines()
+        assert len(lines) == 2
         
-        # Cleanup
-        import shutil
-        shutil.rmtree(storage.base_path)
+        await saver.stop()
+        assert storage.get_post_count("热门") == 2
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_save_appends_only_new_records(self, settings):
+        """Test incremental saves append new records instead of rewriting."""
+        from src.storage import StorageManager
+        
+        await StorageManager(settings).save_posts("热门", [PostData(id="1", text="A", tab="热门")])
+        
+        # A fresh manager still dedupes against what is on disk
+        storage = StorageManager(settings)
+        saved = await storage.save_posts("热门", [
+            PostData(id="1", text="A", tab="热门"),
+            PostData(id="2", text="B", tab="热门"),
+        ])
+        
+        assert saved == 1
+        assert storage.get_post_count("热门") == 2
+        lines = storage._get_raw_filepath("热门").read_bytes().splitlines()
+        assert len(lines) == 2
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_compact_posts_without_stored_hash(self, settings):
+        """Test compaction keys records lacking content_hash on their digest."""
+        import orjson
+        
+        from src.storage import StorageManager
+        
+        storage = StorageManager(settings)
+        records = [
+            {"id": str(i), "text": text, "tab": "热门"}
+            for i, text in enumerate(["A", "B", "C", "A"])
+        ]
+        filepath = storage._get_raw_filepath("热门")
+        filepath.write_bytes(b"".join(orjson.dumps(r) + b"\n" for r in records))
+        
+        assert await storage.compact_posts("热门") == 3
+        assert len(filepath.read_bytes().splitlines()) == 3
+        assert storage.is_duplicate(PostData(id="9", text="B", tab="热门").content_hash)
+    
+    @pytest.mark.parametrize("incremental", [True, False])
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_save_posts_batched_write(self, settings, monkeypatch, incremental):
+        """Test a large save is one write, made off the event loop thread."""
+        import threading
+        
+        from src import storage as storage_module
+        
+        calls = []
+        write_file = storage_module._write_file
+        
+        def spy(filepath, chunks, append=False):
+            calls.append((filepath, append, threading.get_ident()))
+            write_file(filepath, chunks, append)
+        
+        monkeypatch.setattr(storage_module, "_write_file", spy)
+        
+        storage = storage_module.StorageManager(settings)
+        posts = [PostData(id=str(i), text=f"帖子 {i}", tab="热门") for i in range(10000)]
+        saved = await storage.save_posts("热门", posts, incremental=incremental)
+        
+        filepath = storage._get_raw_filepath("热门")
+        post_writes = [call for call in calls if call[0] == filepath]
+        assert saved == 10000
+        assert [call[1] for call in post_writes] == [incremental]
+        assert post_writes[0][2] != threading.get_ident()
+        
+        loaded = await storage.load_existing_posts("热门")
+        assert [p.id for p in loaded] == [p.id for p in posts]
+        assert loaded[-1].content_hash == posts[-1].content_hash
+
+
+class TestSummaryCache:
+    """Test summary cache."""
+    
+    @pytest.fixture
+    def settings(self, tmp_path):
+        """Create test settings with temp directory."""
+        settings = load_settings()
+        settings.storage.base_dir = tmp_path
+        return settings
+    
+    def test_exact_hit_across_runs(self, settings):
+        """Test cached summary is reused and rebound to the new post."""
+        from src.summary_cache import SummaryCache
+        
+        post = PostData(id="1", text="茅台涨停了！", tab="热门")
+        summary = PostSummary(
+            post_id="1",
+            post_hash=post.content_hash,
+            tab="热门",
+            summary="Moutai hit limit up",
+            model_used="test-model"
+        )
+        
+        cache = SummaryCache(settings)
+        cache.load()
+        cache.put(post, summary)
+        cache.save()
+        
+        cache = SummaryCache(settings)
+        cache.load()
+        repost = PostData(id="2", text="茅台涨停了！", tab="资讯")
+        cached = cache.get(repost)
+        
+        assert cached is not None
+        assert cached.post_id == "2"
+        assert cached.tab == "资讯"
+        assert cached.summary == "Moutai hit limit up"
+        assert cache.get(PostData(id="3", text="Other", tab="热门")) is None
 
 
 class TestLLMSummarizer:
@@ -254,6 +635,197 @@ class TestLLMSummarizer:
         assert summary.post_id == "123"
         assert summary.sentiment in [SentimentType.POSITIVE, SentimentType.NEUTRAL, SentimentType.NEGATIVE]
         assert "SH600519" in summary.tickers
+        
+        # Repeats come from the cache; reposts keep their own id
+        assert summarizer._create_fallback_summary(post) is summary
+        repost = summarizer._create_fallback_summary(post.model_copy(update={"id": "456"}))
+        assert repost.post_id == "456"
+        assert repost.summary == summary.summary
+    
+    def test_parse_llm_response(self, settings):
+        """Test single response parsing and validation."""
+        from src.llm_summarizer import LLMSummarizer
+        
+        post = PostData(id="1", text="茅台涨停了！", tab="热门", symbols=["SH600519"])
+        summarizer = LLMSummarizer(settings)
+        
+        summary = summarizer._parse_llm_response(
+            '{"summary": "Moutai up", "sentiment": "Positive", "sentiment_score": "0.5"}',
+            post
+        )
+        assert summary.sentiment == SentimentType.POSITIVE
+        assert summary.sentiment_score == 0.5
+        assert summary.tickers == ["SH600519"]
+        
+        assert summarizer._parse_llm_response("not json", post).model_used == "fallback"
+    
+    def test_parse_batch_response(self, settings):
+        """Test batched response parsing with a missing post."""
+        from src.llm_summarizer import LLMSummarizer
+        
+        posts = [
+            PostData(id="1", text="茅台涨停了！", tab="热门"),
+            PostData(id="2", text="银行股下跌", tab="热门"),
+        ]
+        response = (
+            '{"summaries": [{"post_id": "1", "summary": "Moutai hit limit up", '
+            '"sentiment": "positive", "sentiment_score": 0.9}]}'
+        )
+        
+        summarizer = LLMSummarizer(settings)
+        summaries = summarizer._parse_batch_response(response, posts)
+        
+        assert [s.post_id for s in summaries] == ["1", "2"]
+        assert summaries[0].summary == "Moutai hit limit up"
+        assert summaries[0].sentiment == SentimentType.POSITIVE
+        assert summaries[1].model_used == "fallback"
+        
+        # Valid JSON of the wrong shape falls back for every post
+        for response in ('{"summaries": null}', "5", '"text"'):
+            summaries = summarizer._parse_batch_response(response, posts)
+            assert [s.model_used for s in summaries] == ["fallback", "fallback"]
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_summarize_posts_falls_back_on_failed_chunk(self, settings):
+        """Test a chunk that raises falls back instead of being dropped."""
+        from src.llm_summarizer import LLMSummarizer
+        
+        settings.llm.pack_size = 2
+        posts = [PostData(id=str(i), text=f"帖子 {i}", tab="热门") for i in range(4)]
+        
+        summarizer = LLMSummarizer(settings)
+        summarizer.summarize_batch = AsyncMock(side_effect=RuntimeError("boom"))
+        summaries = await summarizer.summarize_posts(posts)
+        
+        assert [s.post_id for s in summaries] == ["0", "1", "2", "3"]
+        assert all(s.model_used == "fallback" for s in summaries)
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_summarize_posts_packs_requests(self, settings):
+        """Test posts are packed per request and missing ones retried alone."""
+        from src.llm_summarizer import LLMSummarizer
+        
+        settings.llm.pack_size = 2
+        posts = [PostData(id=str(i), text=f"帖子 {i}", tab="热门") for i in range(3)]
+        batch_response = '{"summaries": [{"post_id": "0", "summary": "Packed"}]}'
+        single_response = '{"summary": "Single"}'
+        
+        summarizer = LLMSummarizer(settings)
+        summarizer._call_api = AsyncMock(
+            side_effect=[batch_response, single_response, single_response]
+        )
+        summaries = await summarizer.summarize_posts(posts)
+        
+        assert summarizer._call_api.await_count == 3
+        assert [s.post_id for s in summaries] == ["0", "1", "2"]
+        assert [s.summary for s in summaries] == ["Packed", "Single", "Single"]
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_summarize_posts_retries_respect_concurrency(self, settings):
+        """Test retries of skipped posts stay within max_concurrent_requests."""
+        from src.llm_summarizer import BATCH_SYSTEM_MESSAGE, LLMSummarizer
+        
+        settings.llm.pack_size = 4
+        settings.llm.max_concurrent_requests = 1
+        posts = [PostData(id=str(i), text=f"帖子 {i}", tab="热门") for i in range(4)]
+        active, peak = 0, 0
+        
+        async def call_api(messages):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+            if messages[0] is BATCH_SYSTEM_MESSAGE:
+                return '{"summaries": [{"post_id": "0", "summary": "Packed"}]}'
+            return '{"summary": "Single"}'
+        
+        summarizer = LLMSummarizer(settings)
+        summarizer._call_api = call_api
+        summaries = await summarizer.summarize_posts(posts)
+        
+        assert peak == 1
+        assert [s.summary for s in summaries] == ["Packed", "Single", "Single", "Single"]
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_summarize_batch_garbled_response_not_retried(self, settings):
+        """Test a packed reply covering no post falls back without retries."""
+        from src.llm_summarizer import LLMSummarizer
+        
+        posts = [PostData(id=str(i), text=f"帖子 {i}", tab="热门") for i in range(4)]
+        
+        summarizer = LLMSummarizer(settings)
+        summarizer._call_api = AsyncMock(return_value="not json")
+        summaries = await summarizer.summarize_batch(posts)
+        
+        assert summarizer._call_api.await_count == 1
+        assert [s.post_id for s in summaries] == ["0", "1", "2", "3"]
+        assert all(s.model_used == "fallback" for s in summaries)
+
+
+class TestSummaryPipeline:
+    """Test the crawl-time summarization pipeline."""
+    
+    @pytest.fixture
+    def settings(self, tmp_path):
+        """Create test settings with a per-test temp directory."""
+        settings = load_settings()
+        settings.llm.api_key = "test-key"
+        settings.storage.base_dir = tmp_path
+        return settings
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_summary_pipeline_reuses_duplicates(self, settings):
+        """Test pipeline summarizes each text once and completes tabs as they finish."""
+        from main import SummaryPipeline
+        from src.llm_summarizer import MockLLMSummarizer
+        from src.storage import StorageManager
+        
+        completed = []
+        async with MockLLMSummarizer(settings) as summarizer:
+            summarizer.summarize_posts = AsyncMock(wraps=summarizer.summarize_posts)
+            pipeline = SummaryPipeline(
+                summarizer, StorageManager(settings), workers=2,
+                on_tab_complete=lambda tab, posts, summaries: completed.append(tab)
+            )
+            pipeline.start()
+            await pipeline.add_posts("热门", [PostData(id="1", text="同一条帖子", tab="热门")])
+            await pipeline.add_posts("基金", [PostData(id="2", text="同一条帖子", tab="基金")])
+            pipeline.finish_tab("基金")
+            pipeline.finish_tab("热门")
+            results = await pipeline.join()
+        
+        summarized = [p for call in summarizer.summarize_posts.await_args_list for p in call.args[0]]
+        assert [p.id for p in summarized] == ["1"]
+        assert results["基金"][0].post_id == "2"
+        assert results["基金"][0].tab == "基金"
+        assert sorted(completed) == ["基金", "热门"]
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_summary_pipeline_close_keeps_saves(self, settings):
+        """Test close stops the workers but still writes completed tabs."""
+        from main import SummaryPipeline
+        from src.llm_summarizer import MockLLMSummarizer
+        from src.storage import StorageManager
+        
+        storage = StorageManager(settings)
+        completed = asyncio.Event()
+        async with MockLLMSummarizer(settings) as summarizer:
+            pipeline = SummaryPipeline(
+                summarizer, storage, workers=2,
+                on_tab_complete=lambda tab, posts, summaries: completed.set()
+            )
+            pipeline.start()
+            await pipeline.add_posts("热门", [PostData(id="1", text="帖子", tab="热门")])
+            pipeline.finish_tab("热门")
+            await completed.wait()
+            
+            # The crawl fails here, before join() is reached
+            await pipeline.close()
+        
+        assert all(task.done() for task in pipeline._worker_tasks)
+        summaries = await storage.load_existing_summaries("热门")
+        assert [s.post_id for s in summaries] == ["1"]
 
 
 class TestReportGenerator:
@@ -264,6 +836,12 @@ class TestReportGenerator:
         """Create test settings."""
         return load_settings()
     
+    @pytest.fixture
+    def generator(self, settings):
+        """Create a report generator."""
+        from src.report_generator import ReportGenerator
+        return ReportGenerator(settings)
+    
     @pytest.fixture
     def sample_posts(self):
         """Create sample posts."""
@@ -316,21 +894,51 @@ class TestReportGenerator:
             )
         ]
     
-    def test_aggregate_stock_mentions(self, settings, sample_posts, sample_summaries):
+    def test_aggregate_stock_mentions(self, generator, sample_posts, sample_summaries):
         """Test stock mention aggregation."""
-        from src.report_generator import ReportGenerator
-        
-        generator = ReportGenerator(settings)
         mentions = generator.aggregate_stock_mentions(sample_posts, sample_summaries)
         
         assert len(mentions) >= 2
         assert any(m.symbol == "SH600519" for m in mentions)
     
-    def test_calculate_overall_sentiment(self, settings, sample_summaries):
-        """Test overall sentiment calculation."""
-        from src.report_generator import ReportGenerator
+    def test_aggregate_stock_mentions_at_scale(self, generator):
+        """Test stock mention tallies over 10k posts and 500 symbols."""
+        posts = [
+            PostData(id=str(i), text=f"Post {i}", tab="热门", symbols=[f"SH{i % 500:06d}"])
+            for i in range(10000)
+        ]
+        # Every other post summarized: even ids positive, ids divisible by 4 negative
+        summaries = [
+            PostSummary(
+                post_id=str(i), post_hash=f"hash{i}", tab="热门", summary="",
+                sentiment=SentimentType.NEGATIVE if i % 4 == 0 else SentimentType.POSITIVE,
+                companies=[f"Company {i % 500}"]
+            )
+            for i in range(0, 10000, 2)
+        ]
         
-        generator = ReportGenerator(settings)
+        mentions = generator.aggregate_stock_mentions(posts, summaries)
+        
+        assert len(mentions) == 500
+        assert all(m.mention_count == 20 for m in mentions)
+        by_symbol = {m.symbol: m for m in mentions}
+        even, odd = by_symbol["SH000000"], by_symbol["SH000001"]
+        assert (even.positive_mentions, even.negative_mentions, even.neutral_mentions) == (0, 20, 0)
+        assert (odd.positive_mentions, odd.negative_mentions, odd.neutral_mentions) == (0, 0, 20)
+        assert by_symbol["SH000002"].positive_mentions == 20
+        assert even.name == "Company 0" and odd.name is None
+        assert even.sample_post_ids == ["0", "500", "1000", "1500", "2000"]
+    
+    def test_render_tab_section(self, generator, sample_posts, sample_summaries):
+        """Test per-tab report section rendering."""
+        section = generator.render_tab_section("热门", sample_posts, sample_summaries)
+        
+        assert section.startswith("### 热门")
+        assert "Positive 1, Negative 1, Neutral 0" in section
+        assert "SH600519 (1)" in section
+    
+    def test_calculate_overall_sentiment(self, generator, sample_summaries):
+        """Test overall sentiment calculation."""
         sentiment = generator.calculate_overall_sentiment(sample_summaries)
         
         assert "positive" in sentiment
@@ -338,8 +946,30 @@ class TestReportGenerator:
         assert "neutral" in sentiment
         assert sentiment["positive"] == 1
         assert sentiment["negative"] == 1
+    
+    @pytest.mark.parametrize("n", [2, 1000, 100000])
+    def test_calculate_overall_sentiment_at_scale(self, generator, n):
+        """Test sentiment counts over many summaries, unknown counted as neutral."""
+        kinds = [SentimentType.POSITIVE, SentimentType.NEGATIVE, SentimentType.NEUTRAL, SentimentType.UNKNOWN]
+        prototypes = [
+            PostSummary(post_id=str(i), post_hash=f"hash{i}", tab="热门", summary="", sentiment=kind)
+            for i, kind in enumerate(kinds)
+        ]
+        summaries = [prototypes[i % 4] for i in range(n)]
+        
+        sentiment = generator.calculate_overall_sentiment(summaries)
+        
+        positive = (n + 3) // 4
+        negative = (n + 2) // 4
+        assert sentiment == {"positive": positive, "neutral": n - positive - negative, "negative": negative}
+        assert sentiment == generator._aggregate_summaries(summaries)[1]
 
 
-# Run tests
+# Run tests (in parallel across workers when pytest-xdist is installed)
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
+    from importlib.util import find_spec
+    
+    if find_spec("xdist") is not None:
+        pytest.main([__file__, "-v", "-n", "auto", "--dist=loadscope"])
+    else:
+        pytest.main([__file__, "-v"])